@@ -52,12 +52,13 @@ async def check_price_alert(
                 pct_change=round(pct_change, 1),
             )
             session.add(event)
-            await session.flush()
 
             if rule.notify_dashboard:
                 brand_name = product.brand.name if product.brand else "Unknown"
+                # Linked through the relationship so the event needs no flush
+                # for its id; the commit below writes both in one go.
                 notification = Notification(
-                    alert_event_id=event.id,
+                    alert_event=event,
                     title=f"Price drop: {product.name}",
                     message=(
                         f"{brand_name} — {product.name} dropped {pct_change:.0f}% "
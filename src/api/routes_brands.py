@@ -35,7 +35,7 @@ async def export_all(session: AsyncSession = Depends(get_session)):
             {
                 "name": b.name,
                 "slug": b.slug,
-                "aliases": json.loads(b.aliases) if b.aliases else [],
+                "aliases": b.aliases_list,
                 "category": b.category or "",
                 "alert_threshold_pct": b.alert_threshold_pct,
                 "active": b.active,
@@ -91,7 +91,7 @@ async def export_full(session: AsyncSession = Depends(get_session)):
             {
                 "name": b.name,
                 "slug": b.slug,
-                "aliases": json.loads(b.aliases) if b.aliases else [],
+                "aliases": b.aliases_list,
                 "category": b.category or "",
                 "alert_threshold_pct": b.alert_threshold_pct,
                 "active": b.active,
@@ -178,7 +178,7 @@ async def list_brands(session: AsyncSession = Depends(get_session)):
             "id": b.id,
             "name": b.name,
             "slug": b.slug,
-            "aliases": json.loads(b.aliases) if b.aliases else [],
+            "aliases": b.aliases_list,
             "category": b.category,
             "alert_threshold_pct": b.alert_threshold_pct,
             "active": b.active,
@@ -214,7 +214,7 @@ async def get_brand(brand_id: int, session: AsyncSession = Depends(get_session))
         "id": brand.id,
         "name": brand.name,
         "slug": brand.slug,
-        "aliases": json.loads(brand.aliases) if brand.aliases else [],
+        "aliases": brand.aliases_list,
         "category": brand.category,
         "alert_threshold_pct": brand.alert_threshold_pct,
         "active": brand.active,
@@ -4,10 +4,10 @@ import asyncio
 import datetime as dt
 import json
 import logging
-import re
 import time
 from collections import Counter
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Optional
 from urllib.parse import urlparse
 
 from fastapi import APIRouter, Depends, Form, Request
@@ -29,9 +29,11 @@ from src.db.models import (
     Product,
     Retailer,
     RetailerSuggestion,
+    utcnow,
 )
 from src.db.session import async_session, get_session
 from src.brands.rematch import rematch_brand_products, trigger_rediscovery
+from src.retailers.base import slugify
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +42,24 @@ logger = logging.getLogger(__name__)
 # Entries are ephemeral — they exist only while the server is running.
 _discovery_progress: Dict[str, Dict[str, Any]] = {}
 
+# One asyncio.Event per task key that SSE streams wait on instead of polling.
+# Each progress change sets the current event and drops it, so the next waiter
+# gets a fresh one — every connected stream wakes, not just the first.
+_progress_changed: Dict[str, asyncio.Event] = {}
+
+# Longest an SSE stream waits for a change before re-sending the current
+# state, which doubles as a keep-alive and a disconnect check.
+SSE_KEEPALIVE_SECONDS = 15
+
+_SSE_IDLE_FRAME = f"data: {json.dumps({'status': 'idle'})}\n\n"
+
+
+def _notify_progress(task_key: str) -> None:
+    """Wake every SSE stream following this task."""
+    changed = _progress_changed.pop(task_key, None)
+    if changed is not None:
+        changed.set()
+
 
 def _cleanup_stale_progress() -> None:
     """Remove progress entries older than 5 minutes."""
@@ -47,6 +67,7 @@ def _cleanup_stale_progress() -> None:
     stale = [k for k, v in _discovery_progress.items() if v.get("updated_at", 0) < cutoff]
     for k in stale:
         del _discovery_progress[k]
+        _notify_progress(k)
 
 
 # Strong references to in-flight background jobs. The event loop only holds a
@@ -56,10 +77,28 @@ def _cleanup_stale_progress() -> None:
 # then do nothing at all. Hold the task until it finishes, then drop it.
 _background_tasks: set = set()
 
+# Most background jobs that run at once. Each one scrapes and writes to the
+# DB on the same event loop as the request handlers, so a burst of clicks
+# queues up here instead of starving the dashboard.
+BACKGROUND_JOB_CONCURRENCY = 4
+_background_slots: Optional[asyncio.Semaphore] = None
+
+
+async def _run_when_free(coro) -> None:
+    """Wait for a background slot, then run the job."""
+    global _background_slots
+    if _background_slots is None:
+        _background_slots = asyncio.Semaphore(BACKGROUND_JOB_CONCURRENCY)
+    async with _background_slots:
+        await coro
+
 
 def _spawn(coro) -> None:
-    """Run a coroutine in the background, keeping it alive until it completes."""
-    task = asyncio.create_task(coro)
+    """Run a coroutine in the background, keeping it alive until it completes.
+
+    Jobs beyond BACKGROUND_JOB_CONCURRENCY wait their turn.
+    """
+    task = asyncio.create_task(_run_when_free(coro))
     _background_tasks.add(task)
 
     def _finished(t) -> None:
@@ -72,6 +111,9 @@ def _spawn(coro) -> None:
 
 router = APIRouter(tags=["dashboard"])
 templates = Jinja2Templates(directory="src/templates")
+# Templates ship with the code and only change on deploy, so skip the
+# per-render mtime check on every cached template.
+templates.env.auto_reload = False
 
 # Make auth_enabled available in all templates (for logout/login button in nav)
 templates.env.globals["auth_enabled"] = bool(settings.DASHBOARD_PASSWORD)
@@ -84,25 +126,38 @@ def _is_admin(request: Request) -> bool:
     return bool(request.session.get("authenticated"))
 
 
-def _from_json(value: str) -> list:
-    """Jinja2 filter: parse a JSON string into a Python list."""
+@lru_cache(maxsize=2048)
+def _from_json(value: str) -> tuple:
+    """Jinja2 filter: parse a JSON list string (e.g. product sizes).
+
+    Cached per distinct string, since every card on every page load runs
+    it and size lists repeat heavily; returns a tuple so the cached value
+    can't be mutated by a caller.
+    """
     if not value:
-        return []
+        return ()
     try:
-        return json.loads(value)
+        parsed = json.loads(value)
     except (json.JSONDecodeError, TypeError):
-        return []
+        return ()
+    return tuple(parsed) if isinstance(parsed, list) else ()
 
 
 templates.env.filters["from_json"] = _from_json
 
 
+@lru_cache(maxsize=4096)
 def format_price(cents: int | None) -> str:
+    # Cached: product lists render the same handful of price points over
+    # and over.
     if cents is None:
         return "N/A"
     return f"${cents / 100:,.2f}"
 
 
+templates.env.globals["format_price"] = format_price
+
+
 def _discount_pct(product: Product) -> float:
     return (product.original_price - product.current_price) / product.original_price * 100
 
@@ -186,26 +241,33 @@ async def dashboard(
     brands = brands_result.scalars().all()
 
     # All on-sale products — feeds the stat strip, the capped "Today's Best
-    # Drops" rail, and the per-brand deal-count badges below.
+    # Drops" rail, and the per-brand deal-count badges below. Only the
+    # columns needed to rank them are read here; the handful that make the
+    # rail are loaded in full further down.
     drops_result = await session.execute(
-        select(Product)
+        select(
+            Product.id,
+            Product.brand_id,
+            Product.retailer_id,
+            Product.current_price,
+            Product.original_price,
+        )
         .where(
             Product.on_sale.is_(True),
             Product.original_price.isnot(None),
             Product.original_price > 0,
             Product.current_price.isnot(None),
         )
-        .options(selectinload(Product.brand), selectinload(Product.retailer))
         .order_by(Product.last_checked.desc().nullslast())
     )
-    all_drops = drops_result.scalars().all()
+    all_drops = drops_result.all()
 
     # Restrict the rail to drops we have actually re-confirmed recently.
     # Ranking every on-sale product by discount froze the rail solid: the top
     # slots were all held at the maximum discount by delisted outlet stock,
     # which can never be re-priced and never 404s, so no newly found drop could
     # ever displace them.
-    verified_cutoff = dt.datetime.utcnow() - dt.timedelta(days=RAIL_VERIFIED_DAYS)
+    verified_cutoff = utcnow() - dt.timedelta(days=RAIL_VERIFIED_DAYS)
     verified_ids = set(
         (
             await session.execute(
@@ -224,7 +286,14 @@ async def dashboard(
         reverse=True,
     )
 
-    rail_drops = select_rail_drops(drops_by_discount)
+    rail_ids = [row.id for row in select_rail_drops(drops_by_discount)]
+    rail_result = await session.execute(
+        select(Product)
+        .where(Product.id.in_(rail_ids))
+        .options(selectinload(Product.brand), selectinload(Product.retailer))
+    )
+    rail_by_id = {p.id: p for p in rail_result.scalars().all()}
+    rail_drops = [rail_by_id[pid] for pid in rail_ids if pid in rail_by_id]
 
     deal_counts_by_brand = Counter(p.brand_id for p in all_drops)
     max_discount_pct = int(max((_discount_pct(p) for p in all_drops), default=0))
@@ -301,7 +370,6 @@ async def dashboard(
                 "max_discount_pct": max_discount_pct,
             },
             "unread_count": unread_count,
-            "format_price": format_price,
             "success_message": success_messages.get(success, ""),
             "error_message": error_messages.get(error, ""),
             "is_admin": _is_admin(request),
@@ -406,7 +474,6 @@ async def deals_page(
             "total_products": total_products,
             "per_page": per_page,
             "unread_count": unread_count,
-            "format_price": format_price,
             "is_admin": _is_admin(request),
         },
     )
@@ -450,7 +517,7 @@ async def _scraper_stats(session: AsyncSession) -> dict:
     record far behind. Counting on last_checked alone cannot tell those apart —
     it advances either way, by design.
     """
-    now = dt.datetime.utcnow()
+    now = utcnow()
     cycle_cutoff = now - dt.timedelta(hours=SCRAPER_CYCLE_HOURS)
     active_cutoff = now - dt.timedelta(minutes=SCRAPER_ACTIVE_MINUTES)
 
@@ -613,7 +680,7 @@ async def add_brand_submit(
         return RedirectResponse("/?error=brand_empty_name", status_code=HTTP_303_SEE_OTHER)
 
     # Generate slug
-    slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+    slug = slugify(name)
 
     # Check for duplicate name
     existing_name = await session.execute(
@@ -696,6 +763,9 @@ async def edit_brand_submit(
             status_code=HTTP_303_SEE_OTHER,
         )
 
+    # The rematch compares against what the brand matched before this edit
+    old_name = brand.name
+
     # If name changed, check uniqueness and regenerate slug
     if name != brand.name:
         existing_name = await session.execute(
@@ -707,7 +777,7 @@ async def edit_brand_submit(
                 status_code=HTTP_303_SEE_OTHER,
             )
 
-        slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+        slug = slugify(name)
         existing_slug = await session.execute(
             select(Brand).where(Brand.slug == slug, Brand.id != brand_id)
         )
@@ -722,7 +792,7 @@ async def edit_brand_submit(
 
     # Parse aliases from comma-separated string
     # Handle None, empty string, or whitespace-only input
-    old_aliases = json.loads(brand.aliases) if brand.aliases else []
+    old_aliases = brand.aliases_list
 
     aliases_input = (aliases or "").strip()
     if aliases_input:
@@ -761,7 +831,7 @@ async def edit_brand_submit(
         )
 
         # Delete existing products that may not match new aliases
-        stats = await rematch_brand_products(session, brand)
+        stats = await rematch_brand_products(session, brand, old_aliases, old_name)
         deleted_count = stats.get("deleted", 0)
 
         # Trigger re-discovery in background (don't wait)
@@ -794,8 +864,7 @@ def _get_working_scrapers() -> dict:
     """Get scrapers excluding known-broken ones."""
     from src.retailers import get_all_scrapers
 
-    scrapers = get_all_scrapers()
-    return {k: v for k, v in scrapers.items() if k not in SKIP_SCRAPERS}
+    return get_all_scrapers(skip=SKIP_SCRAPERS)
 
 
 async def _discover_brand_background(brand_id: int) -> None:
@@ -841,7 +910,11 @@ async def _discover_all_background() -> None:
 
 async def _discover_retailer_background(retailer_id: int) -> None:
     """Run discovery for all brands at a single retailer, updating progress."""
-    from src.brands.discovery import discover_brand_at_retailer, store_scraped_products
+    from src.brands.discovery import (
+        discover_brand_at_retailer,
+        load_brand_retailer_pairs,
+        store_scraped_products,
+    )
     from src.retailers import get_all_scrapers
 
     task_key = f"retailer-{retailer_id}"
@@ -851,12 +924,14 @@ async def _discover_retailer_background(retailer_id: int) -> None:
             retailer = await session.get(Retailer, retailer_id)
             if not retailer:
                 _discovery_progress.pop(task_key, None)
+                _notify_progress(task_key)
                 return
 
             all_scrapers = get_all_scrapers()
             scraper = all_scrapers.get(retailer.scraper_type)
             if not scraper:
                 _discovery_progress.pop(task_key, None)
+                _notify_progress(task_key)
                 return
 
             # Fetch all active brands
@@ -876,9 +951,11 @@ async def _discover_retailer_background(retailer_id: int) -> None:
                 "message": "",
                 "updated_at": time.time(),
             }
+            _notify_progress(task_key)
 
             total_products = 0
             total_new = 0
+            existing_pairs = await load_brand_retailer_pairs(session)
 
             try:
                 for i, brand in enumerate(brands):
@@ -888,9 +965,10 @@ async def _discover_retailer_background(retailer_id: int) -> None:
                         "brands_done": i,
                         "updated_at": time.time(),
                     })
+                    _notify_progress(task_key)
 
                     scraped = await discover_brand_at_retailer(
-                        session, brand, retailer, scraper
+                        session, brand, retailer, scraper, existing_pairs
                     )
 
                     brand_new = 0
@@ -908,6 +986,7 @@ async def _discover_retailer_background(retailer_id: int) -> None:
                         "new_products": total_new,
                         "updated_at": time.time(),
                     })
+                    _notify_progress(task_key)
 
                 # Mark as done
                 _discovery_progress[task_key].update({
@@ -916,6 +995,7 @@ async def _discover_retailer_background(retailer_id: int) -> None:
                     "message": f"Found {total_products} products ({total_new} new)",
                     "updated_at": time.time(),
                 })
+                _notify_progress(task_key)
 
                 logger.info(
                     f"Background retailer discovery for {retailer.name}: "
@@ -939,6 +1019,7 @@ async def _discover_retailer_background(retailer_id: int) -> None:
             "message": f"Error: {str(exc)[:200]}",
             "updated_at": time.time(),
         }
+        _notify_progress(task_key)
 
 
 @router.post("/discover")
@@ -1046,7 +1127,6 @@ async def search_products(
             "current_gender": "",
             "current_sort": "",
             "unread_count": unread_count,
-            "format_price": format_price,
             "is_admin": _is_admin(request),
         },
     )
@@ -1166,12 +1246,7 @@ async def brand_detail(
         "brand_slug_taken": "A brand with a similar name already exists.",
     }
 
-    # Parse aliases safely
-    try:
-        aliases = json.loads(brand.aliases) if brand.aliases and brand.aliases != "" else []
-    except (json.JSONDecodeError, TypeError):
-        logger.warning(f"Invalid aliases JSON for brand {brand.id}: {brand.aliases!r}")
-        aliases = []
+    aliases = brand.aliases_list
 
     return templates.TemplateResponse(
         request,
@@ -1182,7 +1257,6 @@ async def brand_detail(
             "linked_retailers": linked_retailers,
             "aliases": aliases,
             "unread_count": unread_count,
-            "format_price": format_price,
             "success_message": brand_success_messages.get(success, ""),
             "error_message": brand_error_messages.get(error, ""),
             "is_admin": _is_admin(request),
@@ -1230,7 +1304,6 @@ async def product_detail(
             "trend": trend,
             "similar_products": similar_products,
             "unread_count": unread_count,
-            "format_price": format_price,
             "is_admin": _is_admin(request),
         },
     )
@@ -1251,7 +1324,6 @@ async def wishlist_page(
         "wishlist.html",
         {
             "unread_count": unread_count,
-            "format_price": format_price,
             "is_admin": _is_admin(request),
         },
     )
@@ -1298,7 +1370,6 @@ async def wishlist_products_partial(
         "components/wishlist_grid.html",
         {
             "products": products,
-            "format_price": format_price,
         },
     )
 
@@ -1458,7 +1529,7 @@ async def discover_retailer(request: Request, retailer_id: int):
 
     # Prevent duplicate discovery runs
     existing = _discovery_progress.get(task_key)
-    if existing and existing.get("status") == "running":
+    if existing and existing.get("status") in ("queued", "running"):
         return JSONResponse(
             {"status": "already_running", "task_key": task_key},
             status_code=409,
@@ -1467,6 +1538,9 @@ async def discover_retailer(request: Request, retailer_id: int):
     # Clean up stale entries
     _cleanup_stale_progress()
 
+    # Mark the run before it gets a background slot, so a second click while
+    # it waits is still caught above.
+    _discovery_progress[task_key] = {"status": "queued", "updated_at": time.time()}
     _spawn(_discover_retailer_background(retailer_id))
     return JSONResponse({"status": "started", "task_key": task_key})
 
@@ -1482,10 +1556,13 @@ async def discover_progress_sse(request: Request, retailer_id: int):
             if await request.is_disconnected():
                 break
 
+            # Take the event before reading, so a change landing between the
+            # read and the wait below still wakes us.
+            changed = _progress_changed.setdefault(task_key, asyncio.Event())
             progress = _discovery_progress.get(task_key)
 
             if progress is None:
-                yield f"data: {json.dumps({'status': 'idle'})}\n\n"
+                yield _SSE_IDLE_FRAME
                 break
 
             yield f"data: {json.dumps(progress)}\n\n"
@@ -1493,7 +1570,10 @@ async def discover_progress_sse(request: Request, retailer_id: int):
             if progress["status"] in ("done", "error"):
                 break
 
-            await asyncio.sleep(0.5)
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
 
     return StreamingResponse(
         event_generator(),
@@ -1540,7 +1620,7 @@ async def edit_retailer(
             )
 
         retailer.name = name
-        retailer.slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+        retailer.slug = slugify(name)
 
     await session.commit()
     logger.info(f"Retailer updated: {retailer.name} (id={retailer_id})")
@@ -1583,9 +1663,6 @@ async def suggest_retailer_submit(
     url: str = Form(...),
     session: AsyncSession = Depends(get_session),
 ):
-    import logging
-    logger = logging.getLogger(__name__)
-
     # Validate URL
     parsed = urlparse(url)
     if not parsed.scheme or not parsed.netloc:
@@ -1608,7 +1685,7 @@ async def suggest_retailer_submit(
         )
 
     # Generate slug
-    slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+    slug = slugify(name)
 
     # Check slug uniqueness
     existing_slug = await session.execute(
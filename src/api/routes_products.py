@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.db.models import Product
+from src.db.models import Brand, Product, Retailer
 from src.db.session import get_session
 from src.tracking.history import get_price_trend
 
@@ -30,8 +31,26 @@ async def list_products(
     gender: str | None = None,
     session: AsyncSession = Depends(get_session),
 ):
-    query = select(Product).options(
-        selectinload(Product.brand), selectinload(Product.retailer)
+    # Select just the rendered columns: rows come back as plain tuples with
+    # no ORM objects to build, and the brand and retailer names are joined in
+    # rather than eager-loading whole rows in two extra queries.
+    query = (
+        select(
+            Product.id,
+            Product.name,
+            Brand.name.label("brand"),
+            Retailer.name.label("retailer"),
+            Product.url,
+            Product.current_price,
+            Product.original_price,
+            Product.on_sale,
+            Product.image_url,
+            Product.thumbnail_url,
+            Product.gender,
+            Product.last_checked,
+        )
+        .outerjoin(Brand, Product.brand_id == Brand.id)
+        .outerjoin(Retailer, Product.retailer_id == Retailer.id)
     )
     if brand_id is not None:
         query = query.where(Product.brand_id == brand_id)
@@ -42,25 +61,16 @@ async def list_products(
 
     query = query.order_by(Product.current_price.asc().nullslast())
     result = await session.execute(query)
-    products = result.scalars().all()
 
-    return [
+    # Everything here is already JSON-ready, so hand it straight to the
+    # response instead of letting FastAPI walk it through jsonable_encoder.
+    return JSONResponse([
         {
-            "id": p.id,
-            "name": p.name,
-            "brand": p.brand.name if p.brand else None,
-            "retailer": p.retailer.name if p.retailer else None,
-            "url": p.url,
-            "current_price": p.current_price,
-            "original_price": p.original_price,
-            "on_sale": p.on_sale,
-            "image_url": p.image_url,
-            "thumbnail_url": p.thumbnail_url,
-            "gender": p.gender,
-            "last_checked": p.last_checked.isoformat() if p.last_checked else None,
+            **row._mapping,
+            "last_checked": row.last_checked.isoformat() if row.last_checked else None,
         }
-        for p in products
-    ]
+        for row in result.all()
+    ])
 
 
 @router.get("/{product_id}")
@@ -24,7 +24,12 @@ router = APIRouter(tags=["auth"])
 templates = Jinja2Templates(directory="src/templates")
 
 # Paths that never require authentication
-PUBLIC_PATHS = {"/health", "/login", "/openapi.json", "/docs", "/docs/oauth2-redirect", "/redoc"}
+PUBLIC_PATHS = frozenset(
+    {"/health", "/ready", "/login", "/openapi.json", "/docs", "/docs/oauth2-redirect", "/redoc"}
+)
+# Path prefixes that never require authentication (static assets, API docs).
+# A tuple so str.startswith checks them all in a single call.
+PUBLIC_PREFIXES = ("/static", "/docs", "/redoc")
 
 
 def is_auth_enabled() -> bool:
@@ -55,12 +60,8 @@ class AuthMiddleware(BaseHTTPMiddleware):
         path = request.url.path
         method = request.method
 
-        # Allow public endpoints
-        if path in PUBLIC_PATHS:
-            return await call_next(request)
-
-        # Allow static files
-        if path.startswith("/static"):
+        # Allow public endpoints and static files
+        if path in PUBLIC_PATHS or path.startswith(PUBLIC_PREFIXES):
             return await call_next(request)
 
         # Already authenticated — allow everything
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
-import json
 import logging
 import re
+from functools import lru_cache
 
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.models import Brand, BrandRetailer, PriceRecord, Product, Retailer
+from src.db.models import Brand, BrandRetailer, Product, Retailer, utcnow
+from src.db.session import bulk_insert_price_records
 from src.retailers.base import RetailerBase, ScrapedProduct
 
 logger = logging.getLogger(__name__)
 
+# How many retailers full discovery scans at once. Each retailer is still
+# searched one brand at a time, so this bounds concurrent domains, not the
+# request rate against any single one.
+DISCOVERY_CONCURRENCY = 8
+
+# Products per multi-row upsert. At ~15 columns a row this keeps each
+# statement well inside SQLite's and asyncpg's bound-parameter limits.
+_UPSERT_CHUNK = 500
+
 
 _KIDS_KEYWORDS = [
     "kids", "kid's", "youth", "junior", "jr.", "jr ",
@@ -24,19 +37,56 @@ _KIDS_KEYWORDS = [
 ]
 
 
+# One case-insensitive alternation scans the name once instead of once per
+# keyword.
+_KIDS_RE = re.compile("|".join(map(re.escape, _KIDS_KEYWORDS)), re.IGNORECASE)
+
+
 def _is_kids_product(name: str) -> bool:
     """Check if a product name indicates a kids/youth item."""
-    lower = name.lower()
-    return any(kw in lower for kw in _KIDS_KEYWORDS)
+    return _KIDS_RE.search(name) is not None
 
 
+# Every ASCII byte that isn't a lowercase letter or digit.
+_NON_ALNUM_BYTES = bytes(
+    b for b in range(128) if not (ord("a") <= b <= ord("z") or ord("0") <= b <= ord("9"))
+)
+
+
+@lru_cache(maxsize=4096)
 def _normalize(name: str) -> str:
     """Normalize a brand name for fuzzy comparison.
 
     Strips punctuation, extra whitespace, and lowercases.
     E.g. "Arc'teryx" → "arcteryx", "A.P.C." → "apc"
     """
-    return re.sub(r"[^a-z0-9]", "", name.lower())
+    # Same result as re.sub(r"[^a-z0-9]", "", name.lower()): dropping non-ASCII
+    # on encode and then the remaining punctuation is two C-level passes with
+    # no regex engine involved.
+    return name.lower().encode("ascii", "ignore").translate(None, _NON_ALNUM_BYTES).decode()
+
+
+@lru_cache(maxsize=1024)
+def _acceptable_names(
+    brand_name: str,
+    aliases: tuple[str, ...],
+) -> tuple[frozenset[str], tuple[str, ...]]:
+    """Normalized names a scraped brand may match exactly, and the subset it
+    may also match as a substring.
+
+    Cached on the brand's name and aliases, so each brand's matcher is built
+    once and an alias edit simply produces a new key.
+
+    Substring matching is ONLY for single-word brands (no spaces in any
+    original name), which prevents "Nike" from matching "Nike ACG", and only
+    for names >= 4 chars to avoid false positives (e.g. "on" matching
+    "salm-on", "nb" matching "bnb").
+    """
+    names = (brand_name,) + aliases
+    acceptable = frozenset(_normalize(n) for n in names)
+    if any(" " in n for n in names):
+        return acceptable, ()
+    return acceptable, tuple(n for n in acceptable if len(n) >= 4)
 
 
 def _brand_matches(
@@ -55,6 +105,19 @@ def _brand_matches(
     Otherwise we compare the scraped brand against the brand name and
     all its aliases using normalized fuzzy matching.
     """
+    # Scrapers usually return the vendor exactly as we store it.
+    if scraped_brand == brand_name or scraped_brand in aliases:
+        return True
+
+    return _matches_acceptable(scraped_brand, *_acceptable_names(brand_name, tuple(aliases)))
+
+
+def _matches_acceptable(
+    scraped_brand: str,
+    acceptable: frozenset[str],
+    fuzzy: tuple[str, ...],
+) -> bool:
+    """_brand_matches against a prebuilt _acceptable_names result."""
     if not scraped_brand:
         # Scraper didn't provide brand info — trust the result
         return True
@@ -63,28 +126,12 @@ def _brand_matches(
     if not norm_scraped:
         return True
 
-    # Build set of acceptable normalized brand names
-    acceptable = {_normalize(brand_name)}
-    for alias in aliases:
-        acceptable.add(_normalize(alias))
-
     # Direct match
     if norm_scraped in acceptable:
         return True
 
-    # Substring match ONLY for single-word brands (no spaces in original)
-    # This prevents "Nike" from matching "Nike ACG"
-    has_compound_name = any(" " in s for s in [brand_name] + aliases)
-
-    if not has_compound_name:
-        # Allow fuzzy substring matching for single-word brands
-        # Only for names >= 4 chars to avoid false positives
-        # (e.g. "on" matching "salm-on", "nb" matching "bnb")
-        for name in acceptable:
-            if name and len(name) >= 4 and (name in norm_scraped or norm_scraped in name):
-                return True
-
-    return False
+    # Fuzzy substring match (empty for compound brands)
+    return any(name in norm_scraped or norm_scraped in name for name in fuzzy)
 
 
 def _filter_by_brand(
@@ -92,15 +139,17 @@ def _filter_by_brand(
     brand: Brand,
 ) -> list[ScrapedProduct]:
     """Filter scraped products to only those matching the expected brand."""
-    aliases = json.loads(brand.aliases) if brand.aliases else []
-    filtered = []
-    rejected = 0
-
-    for p in products:
-        if _brand_matches(p.brand, brand.name, aliases):
-            filtered.append(p)
-        else:
-            rejected += 1
+    aliases = brand.aliases_list
+    # Built once per brand rather than once per product.
+    exact = frozenset([brand.name] + aliases)
+    acceptable, fuzzy = _acceptable_names(brand.name, tuple(aliases))
+    # Scrapers usually return the vendor exactly as we store it; only other
+    # spellings need normalizing.
+    filtered = [
+        p for p in products
+        if p.brand in exact or _matches_acceptable(p.brand, acceptable, fuzzy)
+    ]
+    rejected = len(products) - len(filtered)
 
     if rejected > 0:
         logger.info(
@@ -111,57 +160,158 @@ def _filter_by_brand(
     return filtered
 
 
-async def discover_brand_at_retailer(
-    session: AsyncSession,
+async def _search_brand_at_retailer(
     brand: Brand,
     retailer: Retailer,
     scraper: RetailerBase,
 ) -> list[ScrapedProduct]:
-    """Search for a brand at a retailer and return scraped products."""
+    """Search a retailer for a brand under its name and each alias.
+
+    Network only — no DB access — so it is safe to run many of these
+    concurrently. Returns the first non-empty, brand-filtered result.
+    """
     # For generic scrapers, set the base_url to the retailer's URL
     # so Shopify endpoints point to the right store
     if scraper.slug == "generic" and retailer.base_url:
         scraper.base_url = retailer.base_url.rstrip("/")
 
-    aliases = json.loads(brand.aliases) if brand.aliases else []
-    search_terms = [brand.name] + aliases
-
-    for term in search_terms:
+    # Drop repeats (e.g. an alias identical to the name) so each distinct term
+    # costs one search. Only exact, case-insensitive repeats go: "Arcteryx"
+    # and "Arc'teryx" normalize alike but hit different collection handles.
+    search_terms: list[str] = []
+    seen: set[str] = set()
+    for term in [brand.name] + brand.aliases_list:
+        term = term.strip()
+        if term and term.lower() not in seen:
+            seen.add(term.lower())
+            search_terms.append(term)
+
+    async def _search(term: str) -> list[ScrapedProduct]:
         try:
             products = await scraper.search_brand(term)
-            if products:
-                # Filter out products that don't belong to this brand
-                products = _filter_by_brand(products, brand)
-                if not products:
-                    continue
-
-                # Create or verify BrandRetailer mapping
-                existing = await session.execute(
-                    select(BrandRetailer).where(
-                        BrandRetailer.brand_id == brand.id,
-                        BrandRetailer.retailer_id == retailer.id,
-                    )
-                )
-                if existing.scalar_one_or_none() is None:
-                    br = BrandRetailer(
-                        brand_id=brand.id,
-                        retailer_id=retailer.id,
-                        verified=True,
-                    )
-                    session.add(br)
-                    await session.flush()
-                    logger.info(
-                        f"Discovered: {brand.name} at {retailer.name} "
-                        f"({len(products)} products)"
-                    )
-                return products
         except Exception:
             logger.exception(
                 f"Discovery failed: {brand.name} at {retailer.name} "
                 f"(term: {term})"
             )
+            return []
+        # Filter out products that don't belong to this brand
+        return _filter_by_brand(products, brand) if products else []
+
+    # JS-rendered scrapers drive a single page, so they can't take
+    # overlapping searches; everything else is plain HTTP and can.
+    if len(search_terms) == 1 or scraper.requires_js:
+        for term in search_terms:
+            products = await _search(term)
+            if products:
+                return products
+        return []
+
+    # The terms are independent, so search them all at once and take
+    # whichever non-empty result lands first, cancelling the rest.
+    tasks = [asyncio.create_task(_search(term)) for term in search_terms]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            products = await next_done
+            if products:
+                return products
+        return []
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def load_brand_retailer_pairs(
+    session: AsyncSession,
+    brand_id: int | None = None,
+) -> set[tuple[int, int]]:
+    """Existing (brand_id, retailer_id) mappings in one query, optionally
+    for a single brand."""
+    query = select(BrandRetailer.brand_id, BrandRetailer.retailer_id)
+    if brand_id is not None:
+        query = query.where(BrandRetailer.brand_id == brand_id)
+    result = await session.execute(query)
+    return {(brand_id, retailer_id) for brand_id, retailer_id in result.all()}
+
+
+def _ensure_brand_retailer(
+    session: AsyncSession,
+    brand: Brand,
+    retailer: Retailer,
+    product_count: int,
+    existing_pairs: set[tuple[int, int]],
+) -> None:
+    """Create the BrandRetailer mapping if it doesn't exist yet.
+
+    ``existing_pairs`` comes from load_brand_retailer_pairs and is kept up to
+    date here. The new row is only added to the session; it goes out with
+    the next flush or commit.
+    """
+    pair = (brand.id, retailer.id)
+    if pair in existing_pairs:
+        return
+
+    session.add(
+        BrandRetailer(
+            brand_id=brand.id,
+            retailer_id=retailer.id,
+            verified=True,
+        )
+    )
+    existing_pairs.add(pair)
+    logger.info(
+        f"Discovered: {brand.name} at {retailer.name} "
+        f"({product_count} products)"
+    )
+
+
+async def discover_brand_at_retailer(
+    session: AsyncSession,
+    brand: Brand,
+    retailer: Retailer,
+    scraper: RetailerBase,
+    existing_pairs: set[tuple[int, int]] | None = None,
+) -> list[ScrapedProduct]:
+    """Search for a brand at a retailer and return scraped products.
+
+    Pass ``existing_pairs`` when calling this in a loop to skip the
+    mapping lookup on every hit.
+    """
+    products = await _search_brand_at_retailer(brand, retailer, scraper)
+    if products:
+        if existing_pairs is None:
+            existing_pairs = await load_brand_retailer_pairs(session, brand.id)
+        _ensure_brand_retailer(session, brand, retailer, len(products), existing_pairs)
+    return products
 
-    return []
+
+def _product_upsert(dialect_name: str, rows: list[dict]):
+    """Build a multi-row INSERT ... ON CONFLICT (url) DO UPDATE for products.
+
+    On conflict the price fields are always refreshed; image, thumbnail,
+    gender and sizes only when the scrape actually produced a value, so a
+    sparser search result never blanks out data from an earlier one.
+    """
+    insert_fn = pg_insert if dialect_name == "postgresql" else sqlite_insert
+    stmt = insert_fn(Product).values(rows)
+    excluded = stmt.excluded
+
+    def _unless_blank(column: str):
+        return func.coalesce(func.nullif(excluded[column], ""), Product.__table__.c[column])
+
+    return stmt.on_conflict_do_update(
+        index_elements=[Product.url],
+        set_={
+            "current_price": excluded.current_price,
+            "original_price": excluded.original_price,
+            "on_sale": excluded.on_sale,
+            "last_checked": excluded.last_checked,
+            "image_url": _unless_blank("image_url"),
+            "thumbnail_url": _unless_blank("thumbnail_url"),
+            "gender": _unless_blank("gender"),
+            "sizes": _unless_blank("sizes"),
+        },
+    ).returning(Product.id, Product.url)
 
 
 async def store_scraped_products(
@@ -169,71 +319,81 @@ async def store_scraped_products(
     brand: Brand,
     retailer: Retailer,
     scraped: list[ScrapedProduct],
+    now: dt.datetime | None = None,
 ) -> int:
-    """Store scraped products in the DB. Returns count of new products."""
-    now = dt.datetime.utcnow()
-    new_count = 0
+    """Store scraped products in the DB. Returns count of new products.
+
+    Products are upserted on URL in batches, then one price record per
+    product is bulk-inserted, so a retailer's whole result set costs a
+    handful of statements rather than several per product.
+
+    ``now`` stamps both last_checked and the price records; pass one in to
+    share a timestamp across a whole discovery run.
+    """
+    if now is None:
+        now = utcnow()
 
+    by_url: dict[str, ScrapedProduct] = {}
     for sp in scraped:
-        if not sp.url:
+        if not sp.url or sp.url in by_url:
             continue
 
         if _is_kids_product(sp.name):
             logger.debug(f"Skipping kids product: {sp.name}")
             continue
 
-        # Check if product already exists (by URL)
+        by_url[sp.url] = sp
+
+    if not by_url:
+        # Still commit: the caller may have just added the BrandRetailer
+        await session.commit()
+        return 0
+
+    dialect_name = session.get_bind().dialect.name
+    urls = list(by_url)
+    new_count = 0
+
+    for i in range(0, len(urls), _UPSERT_CHUNK):
+        chunk = urls[i:i + _UPSERT_CHUNK]
+
         existing = await session.execute(
-            select(Product).where(Product.url == sp.url)
+            select(Product.url).where(Product.url.in_(chunk))
         )
-        product = existing.scalar_one_or_none()
-
-        if product:
-            # Update existing product
-            product.current_price = sp.price
-            product.original_price = sp.original_price
-            product.on_sale = sp.on_sale
-            product.last_checked = now
-            if sp.image_url:
-                product.image_url = sp.image_url
-            if sp.thumbnail_url:
-                product.thumbnail_url = sp.thumbnail_url
-            if sp.gender:
-                product.gender = sp.gender
-            if sp.sizes:
-                product.sizes = sp.sizes
-        else:
-            # Create new product
-            product = Product(
-                name=sp.name,
-                brand_id=brand.id,
-                retailer_id=retailer.id,
-                url=sp.url,
-                image_url=sp.image_url or "",
-                thumbnail_url=sp.thumbnail_url or "",
-                sku=sp.sku or "",
-                gender=sp.gender or "",
-                sizes=sp.sizes or "",
-                current_price=sp.price,
-                original_price=sp.original_price,
-                on_sale=sp.on_sale,
-                tracked=True,
-                last_checked=now,
-            )
-            session.add(product)
-            new_count += 1
-
-        await session.flush()
-
-        # Create initial price record
-        record = PriceRecord(
-            product_id=product.id,
-            price=sp.price,
-            original_price=sp.original_price,
-            on_sale=sp.on_sale,
-            currency="CAD",
-        )
-        session.add(record)
+        new_count += len(chunk) - len(existing.scalars().all())
+
+        rows = [
+            {
+                "name": by_url[url].name,
+                "brand_id": brand.id,
+                "retailer_id": retailer.id,
+                "url": url,
+                "image_url": by_url[url].image_url or "",
+                "thumbnail_url": by_url[url].thumbnail_url or "",
+                "sku": by_url[url].sku or "",
+                "gender": by_url[url].gender or "",
+                "sizes": by_url[url].sizes or "",
+                "current_price": by_url[url].price,
+                "original_price": by_url[url].original_price,
+                "on_sale": by_url[url].on_sale,
+                "tracked": True,
+                "last_checked": now,
+            }
+            for url in chunk
+        ]
+        upserted = await session.execute(_product_upsert(dialect_name, rows))
+
+        records = [
+            {
+                "product_id": product_id,
+                "price": by_url[url].price,
+                "original_price": by_url[url].original_price,
+                "on_sale": by_url[url].on_sale,
+                "currency": "CAD",
+                "recorded_at": now,
+            }
+            for product_id, url in upserted.all()
+        ]
+        await bulk_insert_price_records(session, records)
 
     await session.commit()
     return new_count
@@ -243,26 +403,45 @@ async def discover_single_brand(
     session: AsyncSession,
     brand: Brand,
     scrapers: dict[str, RetailerBase],
+    concurrency: int = DISCOVERY_CONCURRENCY,
 ) -> dict[str, int]:
-    """Discover products for a single brand across all active retailers."""
+    """Discover products for a single brand across all active retailers.
+
+    Up to ``concurrency`` retailers are searched at once, and each one's
+    products are stored as soon as its search finishes.
+    """
     retailers_result = await session.execute(
         select(Retailer).where(Retailer.active.is_(True)).order_by(Retailer.name)
     )
     retailers = list(retailers_result.scalars().all())
 
     stats = {"products_found": 0, "new_products": 0, "retailers_matched": 0}
-
-    for retailer in retailers:
-        scraper = scrapers.get(retailer.scraper_type)
-        if scraper is None:
-            continue
-
-        logger.info(f"Searching {retailer.name} for {brand.name}...")
-        scraped = await discover_brand_at_retailer(
-            session, brand, retailer, scraper
-        )
-
+    existing_pairs = await load_brand_retailer_pairs(session, brand.id)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    # The generic scraper points itself at whichever retailer it is searching,
+    # so concurrent searches each need their own instance.
+    own_scrapers: list[RetailerBase] = []
+    # Results go to a single writer as each search finishes, so storing one
+    # retailer's products overlaps the searches still running elsewhere.
+    # Unbounded, so a failed writer can never leave a search stuck on put().
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def _search(retailer: Retailer, scraper: RetailerBase) -> None:
+        async with semaphore:
+            logger.info(f"Searching {retailer.name} for {brand.name}...")
+            scraped = await _search_brand_at_retailer(brand, retailer, scraper)
         if scraped:
+            await results.put((retailer, scraped))
+
+    async def _store_results() -> None:
+        # The only task touching the session until the searches are done
+        while True:
+            item = await results.get()
+            if item is None:
+                return
+            retailer, scraped = item
+            _ensure_brand_retailer(session, brand, retailer, len(scraped), existing_pairs)
             stats["products_found"] += len(scraped)
             new = await store_scraped_products(
                 session, brand, retailer, scraped
@@ -270,6 +449,27 @@ async def discover_single_brand(
             stats["new_products"] += new
             stats["retailers_matched"] += 1
 
+    searches = []
+    for retailer in retailers:
+        scraper = scrapers.get(retailer.scraper_type)
+        if scraper is None:
+            continue
+        if scraper.slug == "generic":
+            scraper = type(scraper)()
+            own_scrapers.append(scraper)
+        searches.append(_search(retailer, scraper))
+
+    writer = asyncio.create_task(_store_results())
+    try:
+        await asyncio.gather(*searches)
+    finally:
+        await results.put(None)
+        try:
+            await writer
+        finally:
+            for scraper in own_scrapers:
+                await scraper.close()
+
     logger.info(
         f"Brand discovery for {brand.name}: {stats['new_products']} products "
         f"across {stats['retailers_matched']} retailers"
@@ -289,11 +489,12 @@ async def discover_single_retailer(
     brands = list(brands_result.scalars().all())
 
     stats = {"brands_checked": len(brands), "products_found": 0, "new_products": 0}
+    existing_pairs = await load_brand_retailer_pairs(session)
 
     for brand in brands:
         logger.info(f"Searching {retailer.name} for {brand.name}...")
         scraped = await discover_brand_at_retailer(
-            session, brand, retailer, scraper
+            session, brand, retailer, scraper, existing_pairs
         )
 
         if scraped:
@@ -313,14 +514,34 @@ async def discover_single_retailer(
 async def discover_and_store(
     session: AsyncSession,
     scrapers: dict[str, RetailerBase],
+    concurrency: int = DISCOVERY_CONCURRENCY,
 ) -> dict[str, int]:
     """Run full discovery: search all brands across all retailers,
-    store products and price records. Returns stats dict."""
+    store products and price records. Returns stats dict.
+
+    Retailers are scanned concurrently (at most ``concurrency`` at a time),
+    but each retailer still works through the brands one after another so
+    the per-domain request delay keeps holding. Only the network side runs
+    in parallel: results are written through the one session, one retailer
+    at a time, since an AsyncSession can't be shared across tasks.
+    """
     brands_result = await session.execute(
         select(Brand).where(Brand.active.is_(True)).order_by(Brand.name)
     )
     brands = list(brands_result.scalars().all())
 
+    retailers_result = await session.execute(
+        select(Retailer).where(Retailer.active.is_(True)).order_by(Retailer.name)
+    )
+    retailers = list(retailers_result.scalars().all())
+
+    # Every lane reads these rows, but a failed store rolls the shared session
+    # back, which would expire them under the other lanes mid-search. Detached
+    # rows keep their loaded values and are out of the rollback's reach; the
+    # writes only need their ids.
+    for row in (*brands, *retailers):
+        session.expunge(row)
+
     stats = {
         "brands_checked": len(brands),
         "retailers_checked": 0,
@@ -329,11 +550,60 @@ async def discover_and_store(
         "new_products": 0,
     }
 
-    for brand in brands:
-        brand_stats = await discover_single_brand(session, brand, scrapers)
-        stats["products_found"] += brand_stats["products_found"]
-        stats["new_products"] += brand_stats["new_products"]
-        stats["mappings_created"] += brand_stats["retailers_matched"]
+    existing_pairs = await load_brand_retailer_pairs(session)
+    now = utcnow()
+    semaphore = asyncio.Semaphore(concurrency)
+    db_lock = asyncio.Lock()
+    # The generic scraper points itself at whichever retailer it is searching,
+    # so concurrent retailers each need their own instance.
+    lane_scrapers: list[RetailerBase] = []
+
+    async def _scan_retailer(retailer: Retailer) -> None:
+        scraper = scrapers.get(retailer.scraper_type)
+        if scraper is None:
+            return
+        if scraper.slug == "generic":
+            scraper = type(scraper)()
+            lane_scrapers.append(scraper)
+
+        async with semaphore:
+            stats["retailers_checked"] += 1
+            for brand in brands:
+                logger.info(f"Searching {retailer.name} for {brand.name}...")
+                scraped = await _search_brand_at_retailer(brand, retailer, scraper)
+                if not scraped:
+                    continue
+
+                async with db_lock:
+                    pair = (brand.id, retailer.id)
+                    is_new_pair = pair not in existing_pairs
+                    try:
+                        _ensure_brand_retailer(
+                            session, brand, retailer, len(scraped), existing_pairs
+                        )
+                        new = await store_scraped_products(
+                            session, brand, retailer, scraped, now=now
+                        )
+                    except Exception:
+                        await session.rollback()
+                        # The rollback discarded the new mapping too; forget it
+                        # so a later store can add it again
+                        if is_new_pair:
+                            existing_pairs.discard(pair)
+                        logger.exception(
+                            f"Failed to store {brand.name} products from {retailer.name}"
+                        )
+                        continue
+
+                stats["products_found"] += len(scraped)
+                stats["new_products"] += new
+                stats["mappings_created"] += 1
+
+    try:
+        await asyncio.gather(*(_scan_retailer(r) for r in retailers))
+    finally:
+        for scraper in lane_scrapers:
+            await scraper.close()
 
     logger.info(
         f"Discovery complete: {stats['new_products']} new products, "
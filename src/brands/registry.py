@@ -2,15 +2,23 @@ from __future__ import annotations
 
 import json
 import logging
-import re
+import time
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.models import Brand, BrandRetailer, Retailer
+from src.retailers.base import slugify
 
 logger = logging.getLogger(__name__)
 
+# Successful exports by prod URL, so re-seeding within a minute (dev reloads,
+# repeated seed_all calls) doesn't fetch the same export again.
+_PROD_DATA_TTL_SECONDS = 60.0
+_prod_data_cache: dict[str, tuple[float, dict]] = {}
+
 
 async def _fetch_prod_data(prod_url: str) -> dict:
     """Fetch brands and retailers from the live prod instance via /api/export.
@@ -18,21 +26,26 @@ async def _fetch_prod_data(prod_url: str) -> dict:
     This 'rescues' any brands/retailers added via the UI before the DB is wiped
     on Render free tier deploys. Returns empty dict on failure (non-blocking).
     """
-    import httpx
+    from src.http_client import get_http_client
+
+    now = time.monotonic()
+    cached = _prod_data_cache.get(prod_url)
+    if cached and now - cached[0] < _PROD_DATA_TTL_SECONDS:
+        return cached[1]
 
     export_url = f"{prod_url.rstrip('/')}/api/export"
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(export_url)
-            if resp.status_code == 200:
-                data = resp.json()
-                logger.info(
-                    f"Auto-rescue: fetched {len(data.get('brands', []))} brands, "
-                    f"{len(data.get('retailers', []))} retailers from prod"
-                )
-                return data
-            else:
-                logger.warning(f"Auto-rescue: /api/export returned {resp.status_code}")
+        resp = await get_http_client().get(export_url, timeout=10.0)
+        if resp.status_code == 200:
+            data = resp.json()
+            logger.info(
+                f"Auto-rescue: fetched {len(data.get('brands', []))} brands, "
+                f"{len(data.get('retailers', []))} retailers from prod"
+            )
+            _prod_data_cache[prod_url] = (now, data)
+            return data
+        else:
+            logger.warning(f"Auto-rescue: /api/export returned {resp.status_code}")
     except Exception:
         logger.warning("Auto-rescue: could not reach prod instance (may be first deploy)")
     return {}
@@ -41,103 +54,103 @@ INITIAL_BRANDS = [
     {
         "name": "APFR",
         "slug": "apfr",
-        "aliases": json.dumps([]),  # No aliases - only match vendor="APFR" exactly
+        "aliases": [],  # No aliases - only match vendor="APFR" exactly
         "category": "home",
     },
     {
         "name": "Arc'teryx",
         "slug": "arcteryx",
-        "aliases": json.dumps(["Arcteryx", "Arc'teryx"]),
+        "aliases": ["Arcteryx", "Arc'teryx"],
         "category": "outdoor",
     },
     {
         "name": "Balmoral",
         "slug": "balmoral",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "fashion",
     },
     {
         "name": "Beams",
         "slug": "beams",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "fashion",
     },
     {
         "name": "Beams Plus",
         "slug": "beams-plus",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "fashion",
     },
     {
         "name": "Ciele",
         "slug": "ciele",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "outdoor",
     },
     {
         "name": "District Vision",
         "slug": "district-vision",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "outdoor",
     },
     {
         "name": "Goldwin",
         "slug": "goldwin",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "fashion",
     },
     {
         "name": "Keen",
         "slug": "keen",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "footwear",
     },
     {
         "name": "Kitowa",
         "slug": "kitowa",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "Perfume",
     },
     {
         "name": "Koumori",
         "slug": "koumori",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "running",
     },
     {
         "name": "Nanga",
         "slug": "nanga",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "fashion",
     },
     {
         "name": "New Balance",
         "slug": "new-balance",
-        "aliases": json.dumps(["NB", "New Balance Made in USA", "New Balance Made in UK"]),
+        "aliases": ["NB", "New Balance Made in USA", "New Balance Made in UK"],
         "category": "sneakers",
     },
     {
         "name": "On Cloud",
         "slug": "on-cloud",
-        "aliases": json.dumps(["On Running", "On"]),
+        "aliases": ["On Running", "On"],
         "category": "running",
     },
     {
         "name": "Patagonia",
         "slug": "patagonia",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "outdoor",
     },
     {
         "name": "Satisfy Running",
         "slug": "satisfy-running",
-        "aliases": json.dumps(["Satisfy"]),
+        "aliases": ["Satisfy"],
         "category": "running",
     },
     {
         "name": "Tekla",
         "slug": "tekla",
-        "aliases": json.dumps([]),
+        "aliases": [],
         "category": "home",
     },
 ]
@@ -342,6 +355,42 @@ INITIAL_RETAILERS = [
 ]
 
 
+def _brand_row(data: dict) -> dict:
+    """A seed or prod-export brand as a row for the bulk insert.
+
+    Seed aliases are plain lists (the prod export may already hand back the
+    stored JSON string); the column holds JSON text. A multi-row INSERT
+    needs the same keys on every row, so every default is filled in.
+    """
+    aliases = data.get("aliases", [])
+    if isinstance(aliases, list):
+        aliases = json.dumps(aliases)
+    return {
+        "name": data["name"],
+        "slug": data["slug"],
+        "aliases": aliases,
+        "category": data.get("category", ""),
+        "alert_threshold_pct": data.get("alert_threshold_pct", 10.0),
+    }
+
+
+def _retailer_row(data: dict) -> dict:
+    """A seed or prod-export retailer as a row for the bulk upsert."""
+    return {
+        "name": data["name"],
+        "slug": data["slug"],
+        "base_url": data.get("base_url", ""),
+        "scraper_type": data.get("scraper_type", "generic"),
+        "requires_js": data.get("requires_js", False),
+    }
+
+
+# The hardcoded seeds, converted (aliases serialized) once at import rather
+# than on every startup seed.
+_INITIAL_BRAND_ROWS = tuple(_brand_row(b) for b in INITIAL_BRANDS)
+_INITIAL_RETAILER_ROWS = tuple(_retailer_row(r) for r in INITIAL_RETAILERS)
+
+
 async def seed_brands(
     session: AsyncSession, extra_brands: list[dict] | None = None
 ) -> None:
@@ -351,34 +400,32 @@ async def seed_brands(
     This ensures all expected brands exist after a DB wipe (Render free tier)
     while preserving any brands added via the UI.
     """
-    # Merge: hardcoded list first, then extras (dedup by slug)
-    all_brands = list(INITIAL_BRANDS)
-    seen_slugs = {b["slug"] for b in all_brands}
-    for eb in extra_brands or []:
-        slug = eb.get("slug") or re.sub(r"[^a-z0-9]+", "-", eb["name"].lower()).strip("-")
-        if slug not in seen_slugs:
-            # Convert prod export format to seed format
-            all_brands.append({
-                "name": eb["name"],
-                "slug": slug,
-                "aliases": json.dumps(eb.get("aliases", [])) if isinstance(eb.get("aliases"), list) else eb.get("aliases", ""),
-                "category": eb.get("category", ""),
-                "alert_threshold_pct": eb.get("alert_threshold_pct", 10.0),
-            })
-            seen_slugs.add(slug)
-
-    added = 0
-    for brand_data in all_brands:
-        existing = await session.execute(
-            select(Brand).where(Brand.slug == brand_data["slug"])
-        )
-        if existing.scalar_one_or_none() is None:
-            session.add(Brand(**brand_data))
-            logger.info(f"Seeded brand: {brand_data['name']}")
-            added += 1
-    if added:
-        await session.commit()
-        logger.info(f"Seeded {added} new brands")
+    # Merge: hardcoded rows first, then extras (dedup by slug)
+    rows = list(_INITIAL_BRAND_ROWS)
+    if extra_brands:
+        seen_slugs = {r["slug"] for r in rows}
+        for eb in extra_brands:
+            slug = eb.get("slug") or slugify(eb["name"])
+            if slug not in seen_slugs:
+                rows.append(_brand_row({**eb, "slug": slug}))
+                seen_slugs.add(slug)
+
+    # One INSERT ... ON CONFLICT (slug) DO NOTHING: no lookup first, and two
+    # workers seeding at once can't trip the unique constraint. RETURNING
+    # only reports the rows actually inserted.
+    insert_fn = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = (
+        insert_fn(Brand)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[Brand.slug])
+        .returning(Brand.name)
+    )
+    seeded = (await session.execute(stmt)).scalars().all()
+    await session.commit()
+    if seeded:
+        for name in seeded:
+            logger.info(f"Seeded brand: {name}")
+        logger.info(f"Seeded {len(seeded)} new brands")
     else:
         logger.info("All seed brands already exist — nothing to add")
 
@@ -392,49 +439,34 @@ async def seed_retailers(
     This ensures all expected retailers exist after a DB wipe (Render free tier)
     while preserving any retailers added via the UI.
     """
-    # Merge: hardcoded list first, then extras (dedup by slug)
-    all_retailers = list(INITIAL_RETAILERS)
-    seen_slugs = {r["slug"] for r in all_retailers}
-    for er in extra_retailers or []:
-        slug = er.get("slug") or re.sub(r"[^a-z0-9]+", "-", er["name"].lower()).strip("-")
-        if slug not in seen_slugs:
-            # Convert prod export format to seed format
-            all_retailers.append({
-                "name": er["name"],
-                "slug": slug,
-                "base_url": er.get("base_url", ""),
-                "scraper_type": er.get("scraper_type", "generic"),
-                "requires_js": er.get("requires_js", False),
-            })
-            seen_slugs.add(slug)
-
-    added = 0
-    updated = 0
-    for retailer_data in all_retailers:
-        existing = await session.execute(
-            select(Retailer).where(Retailer.slug == retailer_data["slug"])
-        )
-        retailer = existing.scalar_one_or_none()
-        if retailer is None:
-            session.add(Retailer(**retailer_data))
-            logger.info(f"Seeded retailer: {retailer_data['name']}")
-            added += 1
-        else:
-            # Update scraper_type if it changed (e.g. generic → dedicated scraper)
-            new_type = retailer_data.get("scraper_type", "generic")
-            if retailer.scraper_type != new_type and new_type != "generic":
-                logger.info(
-                    f"Updated {retailer.name} scraper_type: "
-                    f"{retailer.scraper_type} → {new_type}"
-                )
-                retailer.scraper_type = new_type
-                updated += 1
-    if added or updated:
-        await session.commit()
-        if added:
-            logger.info(f"Seeded {added} new retailers")
-        if updated:
-            logger.info(f"Updated {updated} retailer scraper types")
+    # Merge: hardcoded rows first, then extras (dedup by slug)
+    rows = list(_INITIAL_RETAILER_ROWS)
+    if extra_retailers:
+        seen_slugs = {r["slug"] for r in rows}
+        for er in extra_retailers:
+            slug = er.get("slug") or slugify(er["name"])
+            if slug not in seen_slugs:
+                rows.append(_retailer_row({**er, "slug": slug}))
+                seen_slugs.add(slug)
+
+    # One upsert keyed on slug. An existing retailer is left alone except to
+    # pick up a dedicated scraper (e.g. generic → shopify); it is never
+    # downgraded back to generic.
+    insert_fn = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert_fn(Retailer).values(rows)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Retailer.slug],
+        set_={"scraper_type": excluded.scraper_type},
+        where=(Retailer.scraper_type != excluded.scraper_type)
+        & (excluded.scraper_type != "generic"),
+    ).returning(Retailer.name, Retailer.scraper_type)
+    changed = (await session.execute(stmt)).all()
+    await session.commit()
+    if changed:
+        for row in changed:
+            logger.info(f"Seeded/updated retailer: {row.name} ({row.scraper_type})")
+        logger.info(f"Seeded or updated {len(changed)} retailers")
     else:
         logger.info("All seed retailers already exist — nothing to add")
 
@@ -456,11 +488,9 @@ async def seed_all(session: AsyncSession) -> None:
     await seed_retailers(session, extra_retailers=prod_retailers)
 
 
-async def get_brand_aliases(brand: Brand) -> list[str]:
-    try:
-        return json.loads(brand.aliases) if brand.aliases else []
-    except json.JSONDecodeError:
-        return []
+def get_brand_aliases(brand: Brand) -> list[str]:
+    # Nothing to await: the parse is cached on the raw string by Brand.aliases_list
+    return brand.aliases_list
 
 
 async def get_retailers_for_brand(
@@ -1,9 +1,13 @@
 """Product re-matching when brand aliases change."""
+from __future__ import annotations
+
+import asyncio
 import logging
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.brands.discovery import _acceptable_names
 from src.db.models import Brand, Product
 
 logger = logging.getLogger(__name__)
@@ -12,38 +16,51 @@ logger = logging.getLogger(__name__)
 async def rematch_brand_products(
     session: AsyncSession,
     brand: Brand,
+    old_aliases: list[str] | None = None,
+    old_name: str | None = None,
 ) -> dict[str, int]:
     """Re-match products for a brand after alias changes.
 
-    Deletes all existing products for the brand and triggers re-discovery
-    with the new aliases. This ensures all products match current aliases.
+    Products don't keep the scraped vendor they were matched on, so there is
+    no telling which ones an old alias let in. If the new aliases only widen
+    the match (everything the old set accepted is still accepted), every
+    stored product still matches: nothing is deleted and re-discovery just
+    adds what the new aliases find. Otherwise all of the brand's products are
+    deleted and re-discovered with the new aliases.
 
     Args:
         session: Database session
         brand: Brand to re-match (with updated aliases)
+        old_aliases: The aliases before the change; None always deletes
+        old_name: The brand name before the change, if it was renamed in
+            the same edit; defaults to the current name
 
     Returns:
         Stats dict: {"deleted": count}
     """
-    # Count products before deletion
-    count_result = await session.execute(
-        select(func.count(Product.id)).where(Product.brand_id == brand.id)
-    )
-    product_count = count_result.scalar() or 0
-
-    if product_count == 0:
-        logger.info(f"No products to rematch for brand {brand.name}")
+    if old_aliases is not None and _only_widens(brand, old_aliases, old_name or brand.name):
+        logger.info(f"Aliases for {brand.name} only widened — keeping existing products")
         return {"deleted": 0}
 
-    logger.info(f"Deleting {product_count} products from {brand.name} for re-matching")
-
-    # Delete all products (cascade deletes price_records, alert_events, etc.)
-    await session.execute(delete(Product).where(Product.brand_id == brand.id))
+    # Delete all products (cascade deletes price_records, alert_events, etc.).
+    # The statement's rowcount is the count, so there's no separate COUNT(*).
+    result = await session.execute(delete(Product).where(Product.brand_id == brand.id))
     await session.commit()
+    deleted = result.rowcount or 0
+
+    if deleted:
+        logger.info(f"Deleted {deleted} products from {brand.name} for re-matching")
+    else:
+        logger.info(f"No products to rematch for brand {brand.name}")
+
+    return {"deleted": deleted}
 
-    logger.info(f"Deleted {product_count} products from {brand.name}")
 
-    return {"deleted": product_count}
+def _only_widens(brand: Brand, old_aliases: list[str], old_name: str) -> bool:
+    """Whether every scraped brand the old name and aliases accepted still matches."""
+    old_acceptable, old_fuzzy = _acceptable_names(old_name, tuple(old_aliases))
+    new_acceptable, new_fuzzy = _acceptable_names(brand.name, tuple(brand.aliases_list))
+    return old_acceptable <= new_acceptable and set(old_fuzzy) <= set(new_fuzzy)
 
 
 async def trigger_rediscovery(brand_id: int):
@@ -55,7 +72,12 @@ async def trigger_rediscovery(brand_id: int):
     from src.db.models import Brand
     from src.db.session import async_session
     from src.retailers import get_all_scrapers
+    from src.tracking.scheduler import SKIP_SCRAPERS
 
+    # One set of scrapers (and so one pooled client per retailer) for the
+    # whole run, closed afterwards like every other background discovery.
+    # Known-broken scrapers are skipped, as in the scheduled runs.
+    scrapers = get_all_scrapers(skip=SKIP_SCRAPERS)
     try:
         async with async_session() as session:
             brand = await session.get(Brand, brand_id)
@@ -63,7 +85,6 @@ async def trigger_rediscovery(brand_id: int):
                 logger.error(f"Brand {brand_id} not found for re-discovery")
                 return
 
-            scrapers = get_all_scrapers()
             stats = await discover_single_brand(session, brand, scrapers)
 
             logger.info(
@@ -72,3 +93,7 @@ async def trigger_rediscovery(brand_id: int):
             )
     except Exception as e:
         logger.exception(f"Re-discovery failed for brand {brand_id}: {e}")
+    finally:
+        await asyncio.gather(
+            *(scraper.close() for scraper in scrapers.values()), return_exceptions=True
+        )
@@ -6,6 +6,15 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str = "sqlite+aiosqlite:///./cheapfinder.db"
 
+    # Postgres connection pool. The defaults stay small because the Supabase
+    # Session Pooler caps simultaneous connections; raise them on a plain
+    # Postgres that allows more.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
     SMTP_HOST: str = ""
     SMTP_PORT: int = 587
     SMTP_USER: str = ""
@@ -27,6 +36,8 @@ class Settings(BaseSettings):
     PRICE_CHECK_INTERVAL_MINUTES: int = 30
     PRICE_CHECK_BATCH_SIZE: int = 300
     SAVE_HTML_SNAPSHOTS: bool = False
+    # Open every scraper's connection (DNS + TLS) before startup discovery
+    WARM_SCRAPERS: bool = True
 
     # Render deployment
     RENDER_EXTERNAL_URL: str = ""  # e.g. https://cheap-finder.onrender.com
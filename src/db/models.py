@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import datetime as dt
+import json
+from functools import lru_cache
 from typing import List, Optional
 
 from sqlalchemy import (
@@ -21,6 +23,24 @@ class Base(DeclarativeBase):
     pass
 
 
+def utcnow() -> dt.datetime:
+    """Current UTC time as a naive datetime, matching the DateTime columns.
+
+    Stands in for the deprecated dt.datetime.utcnow().
+    """
+    return dt.datetime.now(dt.timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=512)
+def _parse_aliases(raw: str) -> tuple[str, ...]:
+    """Parse a brand's aliases JSON once per distinct string."""
+    try:
+        aliases = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return ()
+    return tuple(aliases) if isinstance(aliases, list) else ()
+
+
 class Brand(Base):
     __tablename__ = "brands"
 
@@ -32,7 +52,7 @@ class Brand(Base):
     alert_threshold_pct: Mapped[float] = mapped_column(Float, default=10.0)
     active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[dt.datetime] = mapped_column(
-        DateTime, default=dt.datetime.utcnow
+        DateTime, default=utcnow
     )
 
     brand_retailers: Mapped[List[BrandRetailer]] = relationship(
@@ -45,6 +65,15 @@ class Brand(Base):
         back_populates="brand", cascade="all, delete-orphan"
     )
 
+    @property
+    def aliases_list(self) -> list[str]:
+        """Aliases as a list. Invalid or empty JSON gives an empty list.
+
+        The parse is cached on the raw JSON text, so editing aliases needs
+        no invalidation — the new string simply misses the cache.
+        """
+        return list(_parse_aliases(self.aliases)) if self.aliases else []
+
 
 class Retailer(Base):
     __tablename__ = "retailers"
@@ -57,7 +86,7 @@ class Retailer(Base):
     requires_js: Mapped[bool] = mapped_column(Boolean, default=False)
     active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[dt.datetime] = mapped_column(
-        DateTime, default=dt.datetime.utcnow
+        DateTime, default=utcnow
     )
 
     brand_retailers: Mapped[List[BrandRetailer]] = relationship(
@@ -84,7 +113,7 @@ class BrandRetailer(Base):
     brand_url: Mapped[str] = mapped_column(String(500), default="")
     verified: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[dt.datetime] = mapped_column(
-        DateTime, default=dt.datetime.utcnow
+        DateTime, default=utcnow
     )
 
     brand: Mapped[Brand] = relationship(back_populates="brand_retailers")
@@ -97,7 +126,6 @@ class Product(Base):
         UniqueConstraint("url", name="uq_product_url"),
         Index("ix_products_brand_id", "brand_id"),
         Index("ix_products_retailer_id", "retailer_id"),
-        Index("ix_products_on_sale", "on_sale"),
         # The rolling price-check batch orders the whole table by last_checked
         # every 30 minutes to find the stalest products; without this it is a
         # full sort of every product on each run.
@@ -122,7 +150,7 @@ class Product(Base):
     tracked: Mapped[bool] = mapped_column(Boolean, default=True)
     last_checked: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[dt.datetime] = mapped_column(
-        DateTime, default=dt.datetime.utcnow
+        DateTime, default=utcnow
     )
 
     brand: Mapped[Brand] = relationship(back_populates="products")
@@ -132,10 +160,31 @@ class Product(Base):
     )
 
 
+# Dashboard and deals pages filter on on_sale, and the dashboard orders the
+# drops by last_checked DESC NULLS LAST; one composite index serves both (and
+# any on_sale-only lookup via its leading column). Declared per dialect under
+# one name: Postgres puts NULLs first in a DESC index unless told otherwise,
+# while SQLite rejects NULLS LAST in an index but sorts NULLs lowest, so
+# plain DESC already puts them last there.
+Index(
+    "ix_products_on_sale_recent",
+    Product.on_sale,
+    Product.last_checked.desc().nullslast(),
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_products_on_sale_recent",
+    Product.on_sale,
+    Product.last_checked.desc(),
+).ddl_if(dialect="sqlite")
+
+
 class PriceRecord(Base):
     __tablename__ = "price_records"
     __table_args__ = (
-        Index("ix_price_records_product_id", "product_id"),
+        # Price history reads one product's records by date, and the
+        # dashboard takes MAX(recorded_at) per product; both are range scans
+        # on this index. It also covers plain product_id lookups.
+        Index("ix_price_records_product_recorded", "product_id", "recorded_at"),
         Index("ix_price_records_recorded_at", "recorded_at"),
     )
 
@@ -148,7 +197,7 @@ class PriceRecord(Base):
     on_sale: Mapped[bool] = mapped_column(Boolean, default=False)
     currency: Mapped[str] = mapped_column(String(3), default="CAD")
     recorded_at: Mapped[dt.datetime] = mapped_column(
-        DateTime, default=dt.datetime.utcnow
+        DateTime, default=utcnow
     )
 
     product: Mapped[Product] = relationship(back_populates="price_records")
@@ -173,7 +222,7 @@ class AlertRule(Base):
     notify_dashboard: Mapped[bool] = mapped_column(Boolean, default=True)
     active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[dt.datetime] = mapped_column(
-        DateTime, default=dt.datetime.utcnow
+        DateTime, default=utcnow
     )
 
     brand: Mapped[Optional[Brand]] = relationship(back_populates="alert_rules")
@@ -184,6 +233,10 @@ class AlertRule(Base):
 
 class AlertEvent(Base):
     __tablename__ = "alert_events"
+    __table_args__ = (
+        Index("ix_alert_events_rule_id", "rule_id"),
+        Index("ix_alert_events_product_id", "product_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     rule_id: Mapped[int] = mapped_column(
@@ -197,7 +250,7 @@ class AlertEvent(Base):
     pct_change: Mapped[float] = mapped_column(Float, nullable=False)
     sent_email: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[dt.datetime] = mapped_column(
-        DateTime, default=dt.datetime.utcnow
+        DateTime, default=utcnow
     )
 
     rule: Mapped[AlertRule] = relationship(back_populates="alert_events")
@@ -209,6 +262,9 @@ class AlertEvent(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_alert_event_id", "alert_event_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     alert_event_id: Mapped[int] = mapped_column(
@@ -218,7 +274,7 @@ class Notification(Base):
     message: Mapped[str] = mapped_column(Text, default="")
     read: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[dt.datetime] = mapped_column(
-        DateTime, default=dt.datetime.utcnow
+        DateTime, default=utcnow
     )
 
     alert_event: Mapped[AlertEvent] = relationship(back_populates="notifications")
@@ -239,5 +295,14 @@ class RetailerSuggestion(Base):
         ForeignKey("retailers.id"), nullable=True
     )  # set when approved and a Retailer is created
     created_at: Mapped[dt.datetime] = mapped_column(
-        DateTime, default=dt.datetime.utcnow
+        DateTime, default=utcnow
     )
+
+
+class AppMeta(Base):
+    """Key/value bookkeeping for the app itself (e.g. the applied schema fingerprint)."""
+
+    __tablename__ = "app_meta"
+
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    value: Mapped[str] = mapped_column(String(200), default="")
@@ -1,11 +1,14 @@
+from __future__ import annotations
+
+import hashlib
 import logging
 from collections.abc import AsyncGenerator
 
-from sqlalchemy import inspect as sa_inspect, text
+from sqlalchemy import UniqueConstraint, delete, event, insert, inspect as sa_inspect, select, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from src.config import settings
-from src.db.models import Base
+from src.db.models import AppMeta, Base, PriceRecord
 
 logger = logging.getLogger(__name__)
 
@@ -37,20 +40,48 @@ _engine_kwargs: dict = {
 if not _is_sqlite:
     # Supabase Session Pooler has a hard limit on simultaneous connections.
     # Keep a small pool to avoid exhausting it; pre-ping on borrow to detect
-    # stale connections from Render's cold starts.
+    # stale connections from Render's cold starts. All overridable from env.
     _engine_kwargs.update({
-        "pool_size": 5,
-        "max_overflow": 5,
-        "pool_timeout": 30,
-        "pool_recycle": 1800,
-        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
     })
 
 engine = create_async_engine(_db_url, **_engine_kwargs)
 
+if _is_sqlite:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record) -> None:
+        """Per-connection SQLite tuning (WAL itself persists in the file).
+
+        With WAL, synchronous=NORMAL only fsyncs at checkpoints instead of on
+        every commit. A 64 MB page cache, in-memory temp tables and a 256 MB
+        mmap window keep reads off the read() syscall path, and busy_timeout
+        makes a writer wait out a concurrent write instead of failing.
+        """
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+# Python default value -> SQL literal, keyed by exact type (so bool isn't
+# caught as int). Callable defaults (utcnow etc.) have no entry and are skipped.
+_DEFAULT_SQL = {
+    str: lambda v: f"'{v}'",
+    bool: lambda v: "true" if v else "false",
+    int: str,
+    float: str,
+}
+
+
 def _ensure_columns(conn) -> None:
     """Add missing columns to existing tables (create_all doesn't do this).
 
@@ -59,46 +90,48 @@ def _ensure_columns(conn) -> None:
     on every startup (idempotent).
     """
     inspector = sa_inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    # One catalog query for every table's columns on Postgres (SQLite still
+    # asks per table under the hood) instead of a round trip per table.
+    existing_cols = {
+        table_name: {c["name"] for c in cols}
+        for (_schema, table_name), cols in inspector.get_multi_columns().items()
+    }
 
     for table in Base.metadata.sorted_tables:
-        if not inspector.has_table(table.name):
+        if table.name not in existing_tables:
             continue  # create_all already handled new tables
 
-        existing_cols = {c["name"] for c in inspector.get_columns(table.name)}
-
+        add_clauses = []
         for col in table.columns:
-            if col.name not in existing_cols:
-                # Build ALTER TABLE ADD COLUMN statement
-                col_type = col.type.compile(dialect=conn.dialect)
-
-                # Determine default value
-                default = ""
-                if col.default is not None:
-                    default_val = col.default.arg
-                    if isinstance(default_val, str):
-                        default = f" DEFAULT '{default_val}'"
-                    elif isinstance(default_val, bool):
-                        default = f" DEFAULT {'true' if default_val else 'false'}"
-                    elif isinstance(default_val, (int, float)):
-                        default = f" DEFAULT {default_val}"
-
-                # Handle nullability
-                if col.nullable or col.nullable is None:
-                    nullable = ""
-                else:
-                    nullable = " NOT NULL"
-
-                # Build the statement
-                if nullable and default:
-                    stmt = f'ALTER TABLE "{table.name}" ADD COLUMN "{col.name}" {col_type}{default}{nullable}'
-                elif nullable and not default:
-                    # NOT NULL without default — use safe defaults
-                    stmt = f"ALTER TABLE \"{table.name}\" ADD COLUMN \"{col.name}\" {col_type} DEFAULT ''{nullable}"
-                else:
-                    stmt = f'ALTER TABLE "{table.name}" ADD COLUMN "{col.name}" {col_type}{default}'
-
-                conn.execute(text(stmt))
-                logger.info(f"Auto-migration: added column {table.name}.{col.name} ({col_type})")
+            if col.name in existing_cols.get(table.name, ()):
+                continue
+            # Build the ADD COLUMN clause
+            col_type = col.type.compile(dialect=conn.dialect)
+
+            # Determine default value
+            default = ""
+            if col.default is not None:
+                to_sql = _DEFAULT_SQL.get(type(col.default.arg))
+                if to_sql is not None:
+                    default = " DEFAULT " + to_sql(col.default.arg)
+
+            # Handle nullability; NOT NULL without a default gets a safe one
+            nullable = "" if col.nullable or col.nullable is None else " NOT NULL"
+            if nullable and not default:
+                default = " DEFAULT ''"
+            add_clauses.append(f'ADD COLUMN "{col.name}" {col_type}{default}{nullable}')
+            logger.info(f"Auto-migration: adding column {table.name}.{col.name} ({col_type})")
+
+        if not add_clauses:
+            continue
+        if conn.dialect.name == "postgresql":
+            # Postgres takes every ADD COLUMN in one ALTER TABLE
+            conn.execute(text(f'ALTER TABLE "{table.name}" ' + ", ".join(add_clauses)))
+        else:
+            # SQLite only allows one per statement
+            for clause in add_clauses:
+                conn.execute(text(f'ALTER TABLE "{table.name}" {clause}'))
 
 
 def _remove_kids_products(conn) -> None:
@@ -145,14 +178,22 @@ def _ensure_indexes(conn) -> None:
     (catches all errors silently so a slow/failing index never crashes startup).
     """
     inspector = sa_inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    # Every table's indexes in one catalog query on Postgres
+    existing_indexes = {
+        idx["name"]
+        for indexes in inspector.get_multi_indexes().values()
+        for idx in indexes
+    }
     for table in Base.metadata.sorted_tables:
-        if not inspector.has_table(table.name):
+        if table.name not in existing_tables:
             continue
-        existing_indexes = {idx["name"] for idx in inspector.get_indexes(table.name)}
         for index in table.indexes:
             if index.name and index.name not in existing_indexes:
                 try:
-                    index.create(conn)
+                    # Savepoint, so a failure here can't abort init_db's transaction
+                    with conn.begin_nested():
+                        index.create(conn)
                     logger.info(f"Auto-migration: created index {index.name} on {table.name}")
                 except Exception as e:
                     # Index already exists under a different name, dialect issue,
@@ -160,21 +201,161 @@ def _ensure_indexes(conn) -> None:
                     logger.warning(f"Skipped index {index.name}: {e}")
 
 
+def _ensure_unique_constraints(conn) -> None:
+    """Back the models' named unique constraints with unique indexes.
+
+    Like indexes, create_all only adds constraints along with a new table, so
+    a database created before one existed never gets it. The product upsert's
+    ON CONFLICT (url) fails outright without it. Logs and skips a constraint
+    the data already violates rather than crashing startup.
+    """
+    inspector = sa_inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    # Unique column sets per table, read for all tables at once
+    covered: dict[str, set[tuple[str, ...]]] = {}
+    for (_schema, table_name), constraints in inspector.get_multi_unique_constraints().items():
+        covered.setdefault(table_name, set()).update(
+            tuple(uc["column_names"]) for uc in constraints
+        )
+    for (_schema, table_name), indexes in inspector.get_multi_indexes().items():
+        covered.setdefault(table_name, set()).update(
+            tuple(idx["column_names"]) for idx in indexes if idx["unique"]
+        )
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint) or not constraint.name:
+                continue
+            columns = tuple(col.name for col in constraint.columns)
+            if columns in covered.get(table.name, ()):
+                continue
+            column_list = ", ".join(f'"{name}"' for name in columns)
+            try:
+                # In a savepoint: on Postgres a failed statement aborts the
+                # whole transaction, and init_db runs every fixup in one
+                with conn.begin_nested():
+                    conn.execute(text(
+                        f'CREATE UNIQUE INDEX "{constraint.name}" '
+                        f'ON "{table.name}" ({column_list})'
+                    ))
+                logger.info(
+                    f"Auto-migration: created unique index {constraint.name} on {table.name}"
+                )
+            except Exception as e:
+                logger.warning(f"Skipped unique index {constraint.name}: {e}")
+
+
+# Indexes the models no longer declare because another one covers them.
+# _ensure_indexes only ever creates, so these are dropped explicitly.
+_REPLACED_INDEXES = (
+    # Covered by ix_price_records_product_recorded (product_id, recorded_at)
+    "ix_price_records_product_id",
+    # Covered by ix_products_on_sale_recent (on_sale, last_checked DESC)
+    "ix_products_on_sale",
+    # Ascending predecessor of ix_products_on_sale_recent; Postgres can't
+    # read DESC NULLS LAST out of it
+    "ix_products_on_sale_last_checked",
+)
+
+
+def _drop_replaced_indexes(conn) -> None:
+    """Drop indexes superseded by a wider one, so inserts stop maintaining them."""
+    for name in _REPLACED_INDEXES:
+        conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+
+
+# Bump when a data fixup (e.g. _fix_product_urls) changes, so it runs again
+_DATA_FIXUPS_VERSION = 3
+_SCHEMA_FINGERPRINT_KEY = "schema_fingerprint"
+
+
+def _schema_fingerprint() -> str:
+    """Hash of every model table's columns plus the data fixups version.
+
+    Adding or changing a column changes it, so the column sweep and one-off
+    fixups only rerun after a deploy that actually needs them.
+    """
+    parts = [f"fixups={_DATA_FIXUPS_VERSION}"]
+    for table in Base.metadata.sorted_tables:
+        for col in table.columns:
+            parts.append(f"{table.name}.{col.name}:{col.type!r}:{col.nullable}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:32]
+
+
+def _read_schema_fingerprint(conn) -> str | None:
+    if not sa_inspect(conn).has_table(AppMeta.__tablename__):
+        return None  # fresh database, or one from before the fingerprint existed
+    return conn.execute(
+        select(AppMeta.value).where(AppMeta.key == _SCHEMA_FINGERPRINT_KEY)
+    ).scalar_one_or_none()
+
+
+def _write_schema_fingerprint(conn, fingerprint: str) -> None:
+    conn.execute(delete(AppMeta).where(AppMeta.key == _SCHEMA_FINGERPRINT_KEY))
+    conn.execute(insert(AppMeta).values(key=_SCHEMA_FINGERPRINT_KEY, value=fingerprint))
+
+
 async def init_db() -> None:
     async with engine.begin() as conn:
         if _is_sqlite:
             await conn.execute(text("PRAGMA journal_mode=WAL"))
-        await conn.run_sync(Base.metadata.create_all)
-        # Add any missing columns to existing tables
-        await conn.run_sync(_ensure_columns)
-        # Create any missing indexes
+        fingerprint = _schema_fingerprint()
+        schema_changed = await conn.run_sync(_read_schema_fingerprint) != fingerprint
+        if schema_changed:
+            # A matching fingerprint was only ever written once every model
+            # table existed, so create_all's per-table existence checks are
+            # only needed when it differs.
+            await conn.run_sync(Base.metadata.create_all)
+            # Add any missing columns to existing tables
+            await conn.run_sync(_ensure_columns)
+        else:
+            logger.info(
+                "Schema fingerprint unchanged — skipping create_all, column sweep "
+                "and URL fixups"
+            )
+        # Create any missing indexes. Always runs: it retries any index a
+        # previous startup skipped (e.g. timed out on a large table).
         await conn.run_sync(_ensure_indexes)
-        # Fix any product URLs with wrong path patterns
-        await conn.run_sync(_fix_product_urls)
+        await conn.run_sync(_ensure_unique_constraints)
+        if schema_changed:
+            # Fix any product URLs with wrong path patterns
+            await conn.run_sync(_fix_product_urls)
+            await conn.run_sync(_drop_replaced_indexes)
+            await conn.run_sync(_write_schema_fingerprint, fingerprint)
         # Remove kids/youth products that slipped in before the filter
         await conn.run_sync(_remove_kids_products)
 
 
+# Below this a COPY isn't worth the extra protocol round trips
+_COPY_MIN_ROWS = 100
+_PRICE_RECORD_COLUMNS = (
+    "product_id", "price", "original_price", "on_sale", "currency", "recorded_at",
+)
+
+
+async def bulk_insert_price_records(session: AsyncSession, rows: list[dict]) -> None:
+    """Append price records in bulk, inside the session's transaction.
+
+    On Postgres, large batches go through asyncpg's COPY: one parse and
+    permission check for the whole batch instead of per row. Everything else
+    (and SQLite) is a plain executemany INSERT.
+    """
+    if not rows:
+        return
+    if session.get_bind().dialect.name != "postgresql" or len(rows) < _COPY_MIN_ROWS:
+        await session.execute(insert(PriceRecord), rows)
+        return
+
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        PriceRecord.__tablename__,
+        records=[tuple(r[c] for c in _PRICE_RECORD_COLUMNS) for r in rows],
+        columns=list(_PRICE_RECORD_COLUMNS),
+    )
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
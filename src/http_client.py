@@ -0,0 +1,35 @@
+"""Shared HTTP client for one-off outbound requests.
+
+Scrapers keep their own client per instance (they rotate User-Agents and
+pace themselves per retailer). Everything else — the removed-product 404
+check, the keep-alive ping, the prod data rescue — used to open a fresh
+client, and so a fresh TCP + TLS handshake, for every single request.
+They share this one pooled client instead.
+"""
+from __future__ import annotations
+
+import httpx
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use.
+
+    Pass ``timeout=`` per request; the default here is only a backstop.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called on app shutdown)."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
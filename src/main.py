@@ -8,7 +8,8 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy import select, func
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.middleware.sessions import SessionMiddleware
 
 from src.api.routes_alerts import router as alerts_router
@@ -20,6 +21,7 @@ from src.brands.registry import seed_all
 from src.config import settings
 from src.db.models import Product, Retailer
 from src.db.session import async_session, init_db
+from src.http_client import close_http_client
 from src.tracking.scheduler import setup_scheduler, setup_keep_alive
 
 logging.basicConfig(
@@ -29,7 +31,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def _fix_scraper_types() -> None:
+async def _fix_scraper_types(session: AsyncSession) -> None:
     """Auto-fix retailer scraper_type for retailers with dedicated scrapers.
 
     This runs on every startup so that when a new scraper is deployed,
@@ -40,23 +42,49 @@ async def _fix_scraper_types() -> None:
         "bluebuttonshop.com": "bluebuttonshop",
     }
 
-    async with async_session() as session:
-        for url_pattern, correct_type in url_to_scraper.items():
-            result = await session.execute(
-                select(Retailer).where(
-                    Retailer.base_url.contains(url_pattern),
-                    Retailer.scraper_type != correct_type,
-                )
-            )
-            retailer = result.scalar_one_or_none()
-            if retailer:
-                old_type = retailer.scraper_type
-                retailer.scraper_type = correct_type
-                await session.commit()
-                logger.info(
-                    f"Auto-fixed scraper type for {retailer.name}: "
-                    f"{old_type} -> {correct_type}"
-                )
+    # The CASE picks each row's correct type, so one query finds the stale
+    # rows for every pattern and one UPDATE fixes them all
+    correct_type = case(
+        *((Retailer.base_url.contains(pattern), scraper_type)
+          for pattern, scraper_type in url_to_scraper.items()),
+        else_=Retailer.scraper_type,
+    )
+    # Read the old types first: RETURNING only sees the updated row
+    result = await session.execute(
+        select(Retailer.id, Retailer.name, Retailer.scraper_type, correct_type).where(
+            or_(*(Retailer.base_url.contains(pattern) for pattern in url_to_scraper)),
+            Retailer.scraper_type != correct_type,
+        )
+    )
+    stale = result.all()
+    if not stale:
+        return
+
+    await session.execute(
+        update(Retailer)
+        .where(Retailer.id.in_([retailer_id for retailer_id, *_ in stale]))
+        .values(scraper_type=correct_type)
+    )
+    await session.commit()
+    for _, name, old_type, new_type in stale:
+        logger.info(f"Auto-fixed scraper type for {name}: {old_type} -> {new_type}")
+
+
+# How many scrapers open their first connection at once during warm-up
+WARM_UP_CONCURRENCY = 4
+
+
+async def _warm_scrapers(scrapers: dict) -> None:
+    """Prime each scraper's HTTP client, a few retailers at a time."""
+    sem = asyncio.Semaphore(WARM_UP_CONCURRENCY)
+
+    async def warm(scraper) -> None:
+        async with sem:
+            await scraper.warm_up()
+
+    await asyncio.gather(
+        *(warm(scraper) for scraper in scrapers.values() if scraper.base_url)
+    )
 
 
 async def _run_discovery_if_needed() -> None:
@@ -79,23 +107,31 @@ async def _run_discovery_if_needed() -> None:
     from src.brands.discovery import discover_and_store
     from src.retailers import get_all_scrapers
 
-    scrapers = get_all_scrapers()
-
     # Skip known-broken scrapers to avoid wasting time on startup
-    skip = {"simons", "ssense", "nordstrom"}
-    scrapers = {k: v for k, v in scrapers.items() if k not in skip}
+    scrapers = get_all_scrapers(skip={"simons", "ssense", "nordstrom"})
 
-    async with async_session() as session:
-        stats = await discover_and_store(session, scrapers)
+    try:
+        if settings.WARM_SCRAPERS:
+            await _warm_scrapers(scrapers)
 
-    logger.info(
-        f"Startup discovery complete: {stats['new_products']} products, "
-        f"{stats['mappings_created']} brand-retailer mappings"
-    )
+        async with async_session() as session:
+            stats = await discover_and_store(session, scrapers)
 
-    # Close scraper HTTP clients
-    for scraper in scrapers.values():
-        await scraper.close()
+        logger.info(
+            f"Startup discovery complete: {stats['new_products']} products, "
+            f"{stats['mappings_created']} brand-retailer mappings"
+        )
+    finally:
+        # Close scraper HTTP clients, all at once
+        await asyncio.gather(
+            *(scraper.close() for scraper in scrapers.values()), return_exceptions=True
+        )
+
+
+# Set once seeding and the scraper-type fixup have run, i.e. every brand and
+# retailer row exists. /ready reports it; /health stays 200 regardless so
+# Render's health check never waits on seeding.
+_seeded = False
 
 
 async def _startup_background() -> None:
@@ -104,12 +140,15 @@ async def _startup_background() -> None:
     This keeps the lifespan fast so uvicorn binds to the port immediately
     and Render's health check passes.
     """
+    global _seeded
     try:
+        # Seeding and the scraper-type fixup share one session. They run in
+        # order: the fixup must see retailers the seed just added.
         async with async_session() as session:
             await seed_all(session)
-        logger.info("Seeding complete")
-
-        await _fix_scraper_types()
+            logger.info("Seeding complete")
+            await _fix_scraper_types(session)
+        _seeded = True
 
         await _run_discovery_if_needed()
     except Exception:
@@ -138,6 +177,7 @@ async def lifespan(app: FastAPI):
     yield
 
     scheduler.shutdown()
+    await close_http_client()
     logger.info("Cheap Finder stopped")
 
 
@@ -188,3 +228,11 @@ app.include_router(alerts_router)
 @app.get("/health")
 async def health_check():
     return JSONResponse({"status": "ok", "version": "0.1.0"})
+
+
+@app.get("/ready")
+async def readiness_check():
+    """503 until startup seeding has finished, then 200."""
+    if not _seeded:
+        return JSONResponse({"status": "starting"}, status_code=503)
+    return JSONResponse({"status": "ready"})
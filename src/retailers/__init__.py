@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Dict, Optional, Type
+from functools import lru_cache
+from typing import Collection, Dict, Optional, Type
 
 from src.retailers.base import RetailerBase
 from src.retailers.generic import GenericScraper
@@ -16,9 +17,9 @@ from src.retailers.bluebuttonshop import BlueButtonShopScraper
 from src.retailers.the_last_hunt import TheLastHuntScraper
 
 
-
+@lru_cache(maxsize=1)
 def get_scraper_classes() -> Dict[str, Type[RetailerBase]]:
-    """Return a mapping of retailer slug -> scraper class."""
+    """Return a mapping of retailer slug -> scraper class (built once; don't mutate)."""
     return {
         "nrml": NRMLScraper,
         "livestock": LivestockScraper,
@@ -34,9 +35,14 @@ def get_scraper_classes() -> Dict[str, Type[RetailerBase]]:
     }
 
 
-def get_all_scrapers() -> Dict[str, RetailerBase]:
-    """Return a mapping of retailer slug -> instantiated scraper."""
-    return {slug: cls() for slug, cls in get_scraper_classes().items()}
+def get_all_scrapers(skip: Collection[str] = ()) -> Dict[str, RetailerBase]:
+    """Return a mapping of retailer slug -> instantiated scraper.
+
+    Slugs in ``skip`` (e.g. known-broken scrapers) are never instantiated.
+    """
+    return {
+        slug: cls() for slug, cls in get_scraper_classes().items() if slug not in skip
+    }
 
 
 def get_scraper(slug: str) -> RetailerBase:
@@ -51,11 +57,23 @@ def get_scraper(slug: str) -> RetailerBase:
 def get_scraper_for_url(url: str) -> Optional[RetailerBase]:
     """Find the appropriate scraper for a given URL."""
     url_lower = url.lower()
-    for slug, scraper_class in get_scraper_classes().items():
-        if slug == "generic":
-            continue
-        instance = scraper_class()
-        if instance.base_url and instance.base_url.lower() in url_lower:
-            return instance
+    for base_url, scraper_class in _base_url_index():
+        if base_url in url_lower:
+            return scraper_class()
     # Fallback to generic
     return GenericScraper()
+
+
+@lru_cache(maxsize=1)
+def _base_url_index() -> tuple[tuple[str, Type[RetailerBase]], ...]:
+    """(lowercased base_url, class) for every dedicated scraper.
+
+    base_url is a class attribute, so matching a URL needs no instances; only
+    the scraper that matches gets constructed. Scrapers aren't shared, since
+    each owns an HTTP client its caller closes.
+    """
+    return tuple(
+        (scraper_class.base_url.lower(), scraper_class)
+        for slug, scraper_class in get_scraper_classes().items()
+        if slug != "generic" and scraper_class.base_url
+    )
@@ -6,9 +6,7 @@ Search endpoint: /search?query={brand}
 """
 from __future__ import annotations
 
-import json
 import logging
-import re
 import urllib.parse
 
 from src.retailers.base import RetailerBase, ScrapedPrice, ScrapedProduct
@@ -58,15 +56,8 @@ class AltitudeSportsScraper(RetailerBase):
 
     def _extract_from_next_data(self, html: str) -> list[ScrapedProduct]:
         """Extract products from __NEXT_DATA__ Algolia search results."""
-        match = re.search(
-            r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', html, re.DOTALL
-        )
-        if not match:
-            return []
-
-        try:
-            data = json.loads(match.group(1))
-        except json.JSONDecodeError:
+        data = extract_next_data(html)
+        if data is None:
             return []
 
         page_props = data.get("props", {}).get("pageProps", {})
@@ -92,6 +83,14 @@ class AltitudeSportsScraper(RetailerBase):
     @staticmethod
     def _extract_cents(price_obj) -> int | None:
         """Extract price in cents from Altitude Sports price structure."""
+        # Almost every hit is {"CAD": {"centAmount": [N]}}; try that first
+        try:
+            cents = price_obj["CAD"]["centAmount"][0]
+            if isinstance(cents, int):
+                return cents
+        except (KeyError, TypeError, IndexError):
+            pass
+
         if not isinstance(price_obj, dict):
             return None
         cad = price_obj.get("CAD", {})
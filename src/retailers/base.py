@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import random
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Iterator
 
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from src.config import settings
 
@@ -21,6 +26,59 @@ USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:133.0) Gecko/20100101 Firefox/133.0",
 ]
 
+# Adaptive back-off for retailers that start answering 429 Too Many Requests.
+# Each 429 doubles the delay before the next request to that retailer (or
+# jumps to its Retry-After, if longer); each success walks it back down by a
+# fixed step until it is at the configured REQUEST_DELAY_SECONDS again.
+MAX_REQUEST_DELAY_SECONDS = 60.0
+REQUEST_DELAY_STEP_SECONDS = 1.0
+RATE_LIMIT_RETRIES = 2
+
+# BeautifulSoup tree builder for every scraped page. lxml's C parser is
+# several times faster than the pure-Python "html.parser" on large pages.
+HTML_PARSER = "lxml"
+
+# Product-page prices come from <meta> tags and JSON-LD <script> blocks. Parsing
+# with this strainer keeps only those, so the parser doesn't build a tree
+# for the rest of the page.
+PRICE_TAGS = SoupStrainer(["meta", "script"])
+
+_NON_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def extract_embedded_json(text: str, anchor: str, separator: str = "=") -> Any:
+    """Decode the JSON value assigned right after ``anchor`` in page source.
+
+    Handles ``window.__STATE__ = {...};`` (separator "=") and ``"key": [...]``
+    (separator ":"). The value is read with the JSON decoder's raw_decode, a
+    single linear pass that knows where strings start and end, so braces
+    inside strings can't cut it short the way a non-greedy regex does.
+    Returns None when no occurrence of the anchor is followed by valid JSON.
+    """
+    start = text.find(anchor)
+    while start != -1:
+        pos = start + len(anchor)
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if text.startswith(separator, pos):
+            pos += len(separator)
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+            try:
+                return _JSON_DECODER.raw_decode(text, pos)[0]
+            except json.JSONDecodeError:
+                pass
+        start = text.find(anchor, start + 1)
+    return None
+
+
+def slugify(name: str) -> str:
+    """Lowercase hyphenated slug: "Arc'teryx Veilance" → "arc-teryx-veilance"."""
+    return _NON_SLUG_RE.sub("-", name.lower()).strip("-")
+
 
 @dataclass
 class ScrapedProduct:
@@ -51,11 +109,29 @@ class RetailerBase(ABC):
     slug: str = ""
     base_url: str = ""
     requires_js: bool = False
+    # Known brand name → site-specific URL slug / collection handle
+    brand_slug_map: dict[str, str] = {}
+    _brand_slug_pairs: tuple[tuple[str, str], ...] = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # Longest key first, so "goldwin 0" is tried before "goldwin" matches
+        # inside it. Sorted once per class rather than on every lookup.
+        cls._brand_slug_pairs = tuple(sorted(
+            ((key.lower(), slug) for key, slug in cls.brand_slug_map.items()),
+            key=lambda pair: -len(pair[0]),
+        ))
 
     def __init__(self) -> None:
         self._client: httpx.AsyncClient | None = None
+        self._delay: float = float(settings.REQUEST_DELAY_SECONDS)
+        # Serializes the request delay, so overlapping searches still start
+        # their requests to this retailer one delay apart.
+        self._pace_lock: asyncio.Lock | None = None
+        # Loop time the last request to this retailer started
+        self._last_request: float = float("-inf")
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
                 timeout=30.0,
@@ -64,30 +140,120 @@ class RetailerBase(ABC):
             )
         return self._client
 
+    async def warm_up(self) -> None:
+        """Open the client's connection to the retailer ahead of real requests.
+
+        A HEAD to the home page pays for DNS and the TLS handshake, and the
+        pooled connection is reused by the first search. Failures are ignored:
+        the real request will surface them. It is paced like any other
+        request, so the first real one still waits out the delay after it.
+        """
+        if not self.base_url:
+            return  # the generic scraper only gets a URL per retailer
+        try:
+            await self._pace()
+            await self._get_client().head(self.base_url, timeout=2.0)
+        except Exception:
+            logger.debug(f"{self.name}: warm-up request failed")
+
     async def close(self) -> None:
         if self._client and not self._client.is_closed:
             await self._client.aclose()
 
+    def _back_off(self, retry_after: str | None) -> None:
+        """Slow down after a 429: double the delay, honouring Retry-After."""
+        delay = max(self._delay * 2, REQUEST_DELAY_STEP_SECONDS)
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        self._delay = min(delay, MAX_REQUEST_DELAY_SECONDS)
+        logger.warning(f"{self.name}: rate limited, request delay now {self._delay:.0f}s")
+
+    def _ease_off(self) -> None:
+        """Step the delay back towards the configured baseline after a success."""
+        baseline = float(settings.REQUEST_DELAY_SECONDS)
+        if self._delay > baseline:
+            self._delay = max(baseline, self._delay - REQUEST_DELAY_STEP_SECONDS)
+
+    async def _pace(self) -> None:
+        """Wait until the request delay since the last request has passed."""
+        if self._pace_lock is None:
+            self._pace_lock = asyncio.Lock()
+        async with self._pace_lock:
+            # The delay counts from the previous request's start, so time
+            # spent downloading and parsing it is not waited out twice
+            loop = asyncio.get_running_loop()
+            await asyncio.sleep(max(0.0, self._last_request + self._delay - loop.time()))
+            self._last_request = loop.time()
+
     async def _fetch(self, url: str) -> str:
-        await asyncio.sleep(settings.REQUEST_DELAY_SECONDS)
-        client = await self._get_client()
-        client.headers["User-Agent"] = random.choice(USER_AGENTS)
-        resp = await client.get(url)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            await self._pace()
+            # Per-request header: overlapping fetches share the client, so
+            # setting client.headers would race between them
+            resp = await self._get_client().get(
+                url, headers={"User-Agent": random.choice(USER_AGENTS)}
+            )
+            if resp.status_code != 429:
+                self._ease_off()
+                break
+            self._back_off(resp.headers.get("Retry-After"))
         resp.raise_for_status()
         return resp.text
 
-    async def _fetch_soup(self, url: str) -> BeautifulSoup:
+    async def _fetch_soup(
+        self, url: str, parse_only: SoupStrainer | None = None
+    ) -> BeautifulSoup:
         html = await self._fetch(url)
-        return BeautifulSoup(html, "html.parser")
+        return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+    def _mapped_brand_slug(self, brand_name: str) -> str | None:
+        """Look a brand up in brand_slug_map by substring, or None.
+
+        A key inside the brand name wins first ("new balance" for "New
+        Balance Made in USA"); failing that, the brand name inside a key
+        ("on" for "on cloud").
+        """
+        lower = brand_name.lower()
+        for key, slug in self._brand_slug_pairs:
+            if key in lower:
+                return slug
+        for key, slug in self._brand_slug_pairs:
+            if lower in key:
+                return slug
+        return None
+
+    @staticmethod
+    def _json_ld_products(soup: BeautifulSoup) -> Iterator[dict]:
+        """Yield each JSON-LD Product block on a product page, parsed.
+
+        Only a Product block carries the price, so any other block (breadcrumbs,
+        organization) is skipped by a substring check without being parsed.
+        """
+        for script in soup.find_all("script", {"type": "application/ld+json"}):
+            text = script.string or ""
+            if '"Product"' not in text:
+                continue
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(data, list):
+                data = data[0] if data else None
+            if isinstance(data, dict) and data.get("@type") == "Product":
+                yield data
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def parse_price(text: str) -> int | None:
+        # Cached: listing pages repeat the same few price strings many times
         if not text:
             return None
         cleaned = text.replace("$", "").replace(",", "").replace("CAD", "").strip()
+        # Decimal, not float: float("19.99") * 100 is 1998.999..., which
+        # truncated to 1998 cents
         try:
-            return int(float(cleaned) * 100)
-        except (ValueError, TypeError):
+            return int(Decimal(cleaned) * 100)
+        except (InvalidOperation, ValueError, TypeError, OverflowError):
             return None
 
     @abstractmethod
@@ -100,7 +266,7 @@ class RetailerBase(ABC):
 
     async def health_check(self) -> bool:
         try:
-            client = await self._get_client()
+            client = self._get_client()
             resp = await client.get(self.base_url)
             return resp.status_code == 200
         except Exception:
@@ -16,12 +16,21 @@ from __future__ import annotations
 import logging
 import re
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 
 from src.retailers.base import RetailerBase, ScrapedPrice, ScrapedProduct
 
 logger = logging.getLogger(__name__)
 
+# Sale prices are the red span inside css-price
+_RED_STYLE_RE = re.compile(r"color:\s*red")
+
+# Listing pages only need the product cards; the strainer keeps the header,
+# menus and footer out of the tree
+_PRODUCT_FRAMES = SoupStrainer("div", class_="css-prod-frame")
+# The parts of a card _parse_product_card reads, collected in one walk
+_CARD_SECTIONS = ("css-image", "css-desc", "css-price")
+
 
 class BlueButtonShopScraper(RetailerBase):
     """Scraper for Blue Button Shop (custom PHP platform)."""
@@ -51,10 +60,9 @@ class BlueButtonShopScraper(RetailerBase):
 
     def _brand_to_url_slug(self, brand_name: str) -> str:
         """Convert a brand name to BBS URL slug format."""
-        lower = brand_name.lower()
-        for key, slug in self.brand_slug_map.items():
-            if key in lower or lower in key:
-                return slug
+        mapped = self._mapped_brand_slug(brand_name)
+        if mapped:
+            return mapped
         # Fallback: capitalize words and join with hyphens
         return "-".join(w.capitalize() for w in brand_name.split())
 
@@ -67,7 +75,7 @@ class BlueButtonShopScraper(RetailerBase):
         # Try brand page (D = all genders)
         brand_url = f"{self.base_url}/shop/BRAND/D/{slug}/ALL/0"
         try:
-            soup = await self._fetch_soup(brand_url)
+            soup = await self._fetch_soup(brand_url, parse_only=_PRODUCT_FRAMES)
             products = self._parse_product_listing(soup, brand_name)
             if products:
                 logger.info(
@@ -83,7 +91,7 @@ class BlueButtonShopScraper(RetailerBase):
         # Fallback: try search
         search_url = f"{self.base_url}/shop/SEARCH/D/{slug}/ALL/0"
         try:
-            soup = await self._fetch_soup(search_url)
+            soup = await self._fetch_soup(search_url, parse_only=_PRODUCT_FRAMES)
             products = self._parse_product_listing(soup, brand_name)
             if products:
                 logger.info(
@@ -137,8 +145,13 @@ class BlueButtonShopScraper(RetailerBase):
         self, frame: Tag, brand_name: str
     ) -> ScrapedProduct | None:
         """Parse a single css-prod-frame into a ScrapedProduct."""
+        sections: dict[str, Tag] = {}
+        for div in frame.find_all("div", class_=_CARD_SECTIONS):
+            for cls in div.get("class", ()):
+                sections.setdefault(cls, div)
+
         # Get product URL from the image link
-        image_div = frame.find("div", class_="css-image")
+        image_div = sections.get("css-image")
         if not image_div:
             return None
 
@@ -163,7 +176,7 @@ class BlueButtonShopScraper(RetailerBase):
                 thumbnail_url = full_src
 
         # Get brand and product name from css-desc
-        desc_div = frame.find("div", class_="css-desc")
+        desc_div = sections.get("css-desc")
         if not desc_div:
             return None
 
@@ -179,7 +192,7 @@ class BlueButtonShopScraper(RetailerBase):
             return None
 
         # Parse price from css-price div
-        price_div = frame.find("div", class_="css-price")
+        price_div = sections.get("css-price")
         if not price_div:
             return None
 
@@ -223,7 +236,7 @@ class BlueButtonShopScraper(RetailerBase):
             # Sale item
             original_price = self.parse_price(strike_span.get_text(strip=True))
             # Sale price is the span with color:red
-            sale_span = price_div.find("span", style=re.compile(r"color:\s*red"))
+            sale_span = price_div.find("span", style=_RED_STYLE_RE)
             if sale_span:
                 sale_price = self.parse_price(sale_span.get_text(strip=True))
             else:
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import json
 import logging
 import re
 
-from src.retailers.base import RetailerBase, ScrapedPrice, ScrapedProduct
+from src.retailers.base import PRICE_TAGS, RetailerBase, ScrapedPrice, ScrapedProduct
 from src.retailers.shopify_base import ShopifyBase
 
 logger = logging.getLogger(__name__)
 
+# Price <meta> properties, most specific first
+_PRICE_META_PROPERTIES = ("product:price:amount", "og:price:amount")
+
 
 class GenericScraper(ShopifyBase):
     """Generic scraper that tries Shopify endpoints first, then falls back
@@ -33,7 +37,7 @@ class GenericScraper(ShopifyBase):
 
         # Fallback: parse HTML for meta tags and JSON-LD
         try:
-            soup = await self._fetch_soup(product_url)
+            soup = await self._fetch_soup(product_url, parse_only=PRICE_TAGS)
         except Exception:
             logger.exception(f"Failed to fetch {product_url}")
             return None
@@ -48,21 +52,25 @@ class GenericScraper(ShopifyBase):
         return ScrapedPrice(price=price)
 
     def _extract_price_from_meta(self, soup) -> int | None:
-        meta = soup.find("meta", {"property": "product:price:amount"})
-        if meta and meta.get("content"):
-            return self.parse_price(meta["content"])
+        # One walk collects both tags; product:price:amount still wins
+        found: dict[str, str] = {}
+        for meta in soup.find_all("meta", property=_PRICE_META_PROPERTIES):
+            if meta.get("content"):
+                found.setdefault(meta["property"], meta["content"])
 
-        meta = soup.find("meta", {"property": "og:price:amount"})
-        if meta and meta.get("content"):
-            return self.parse_price(meta["content"])
+        for prop in _PRICE_META_PROPERTIES:
+            if prop in found:
+                return self.parse_price(found[prop])
 
         return None
 
     def _extract_price_from_json_ld(self, soup) -> int | None:
-        import json
-
         scripts = soup.find_all("script", {"type": "application/ld+json"})
         for script in scripts:
+            # Breadcrumb/Organization/WebSite blocks carry no offers; skip
+            # them on a substring check instead of decoding them
+            if '"offers"' not in (script.string or ""):
+                continue
             try:
                 data = json.loads(script.string)
                 if isinstance(data, list):
@@ -7,9 +7,15 @@ from __future__ import annotations
 
 import json
 import logging
-import re
 
-from src.retailers.base import RetailerBase, ScrapedPrice, ScrapedProduct
+from src.retailers.base import (
+    PRICE_TAGS,
+    RetailerBase,
+    ScrapedPrice,
+    ScrapedProduct,
+    extract_embedded_json,
+    slugify,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,11 +35,7 @@ class HavenScraper(RetailerBase):
     }
 
     def _brand_to_slug(self, brand_name: str) -> str:
-        lower = brand_name.lower()
-        for key, slug in self.brand_slug_map.items():
-            if key in lower or lower in key:
-                return slug
-        return re.sub(r"[^a-z0-9]+", "-", lower).strip("-")
+        return self._mapped_brand_slug(brand_name) or slugify(brand_name)
 
     async def search_brand(self, brand_name: str) -> list[ScrapedProduct]:
         slug = self._brand_to_slug(brand_name)
@@ -80,31 +82,26 @@ class HavenScraper(RetailerBase):
 
     async def get_price(self, product_url: str) -> ScrapedPrice | None:
         try:
-            soup = await self._fetch_soup(product_url)
+            soup = await self._fetch_soup(product_url, parse_only=PRICE_TAGS)
         except Exception:
             logger.exception(f"{self.name}: Failed to fetch {product_url}")
             return None
 
         # Try JSON-LD Product
-        scripts = soup.find_all("script", {"type": "application/ld+json"})
-        for script in scripts:
+        for data in self._json_ld_products(soup):
             try:
-                data = json.loads(script.string)
-                if isinstance(data, list):
-                    data = data[0]
-                if data.get("@type") == "Product":
-                    offers = data.get("offers", {})
-                    if isinstance(offers, list):
-                        offers = offers[0] if offers else {}
-
-                    price = self.parse_price(str(offers.get("price", "")))
-                    if price is not None:
-                        return ScrapedPrice(
-                            price=price,
-                            currency=offers.get("priceCurrency", "CAD"),
-                            available=offers.get("availability", "").endswith("InStock"),
-                        )
-            except (json.JSONDecodeError, AttributeError):
+                offers = data.get("offers", {})
+                if isinstance(offers, list):
+                    offers = offers[0] if offers else {}
+
+                price = self.parse_price(str(offers.get("price", "")))
+                if price is not None:
+                    return ScrapedPrice(
+                        price=price,
+                        currency=offers.get("priceCurrency", "CAD"),
+                        available=offers.get("availability", "").endswith("InStock"),
+                    )
+            except AttributeError:
                 continue
 
         # Fallback: meta tag
@@ -164,24 +161,11 @@ class HavenScraper(RetailerBase):
             if "window.__remixContext" not in text:
                 continue
 
-            # Extract JSON from the script using brace balancing
-            match = re.search(r"window\.__remixContext\s*=\s*(\{.*)", text, re.DOTALL)
-            if not match:
+            context = extract_embedded_json(text, "window.__remixContext")
+            if not isinstance(context, dict):
                 continue
 
             try:
-                raw = match.group(1)
-                depth = 0
-                end = 0
-                for i, ch in enumerate(raw):
-                    if ch == "{":
-                        depth += 1
-                    elif ch == "}":
-                        depth -= 1
-                    if depth == 0:
-                        end = i + 1
-                        break
-                context = json.loads(raw[:end])
                 # Navigate to products in the loader data
                 loader_data = context.get("state", {}).get("loaderData", {})
                 for key, value in loader_data.items():
@@ -194,7 +178,7 @@ class HavenScraper(RetailerBase):
                             scraped = self._parse_hydrogen_node(node)
                             if scraped:
                                 products.append(scraped)
-            except (json.JSONDecodeError, AttributeError, KeyError):
+            except (AttributeError, KeyError):
                 continue
 
         return products
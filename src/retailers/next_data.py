@@ -17,16 +17,31 @@ from __future__ import annotations
 
 import json
 import logging
-import re
 from typing import Optional
 
 from src.retailers.base import ScrapedPrice
 
 logger = logging.getLogger(__name__)
 
-_NEXT_DATA_RE = re.compile(
-    r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL
-)
+_NEXT_DATA_TAG = '<script id="__NEXT_DATA__"'
+
+
+def _slice_next_data(html: str) -> Optional[str]:
+    """The text inside the __NEXT_DATA__ script tag, or None.
+
+    The tag and its end are fixed strings, so plain str.find locates them; no
+    regex needs to walk the (often several hundred KB) page.
+    """
+    tag = html.find(_NEXT_DATA_TAG)
+    if tag == -1:
+        return None
+    start = html.find(">", tag + len(_NEXT_DATA_TAG))
+    if start == -1:
+        return None
+    end = html.find("</script>", start)
+    if end == -1:
+        return None
+    return html[start + 1:end]
 
 
 def extract_next_data(html: str) -> Optional[dict]:
@@ -35,11 +50,11 @@ def extract_next_data(html: str) -> Optional[dict]:
     Must be given raw HTML — matching against BeautifulSoup's .text can never
     work, since that strips the very <script> tag being searched for.
     """
-    match = _NEXT_DATA_RE.search(html)
-    if not match:
+    raw = _slice_next_data(html)
+    if raw is None:
         return None
     try:
-        return json.loads(match.group(1))
+        return json.loads(raw)
     except json.JSONDecodeError:
         return None
 
@@ -8,7 +8,7 @@ import json
 import logging
 import urllib.parse
 
-from src.retailers.base import RetailerBase, ScrapedPrice, ScrapedProduct
+from src.retailers.base import PRICE_TAGS, RetailerBase, ScrapedPrice, ScrapedProduct
 
 logger = logging.getLogger(__name__)
 
@@ -58,30 +58,25 @@ class NordstromScraper(RetailerBase):
 
     async def get_price(self, product_url: str) -> ScrapedPrice | None:
         try:
-            soup = await self._fetch_soup(product_url)
+            soup = await self._fetch_soup(product_url, parse_only=PRICE_TAGS)
         except Exception:
             logger.exception(f"{self.name}: Failed to fetch {product_url}")
             return None
 
         # JSON-LD
-        scripts = soup.find_all("script", {"type": "application/ld+json"})
-        for script in scripts:
+        for data in self._json_ld_products(soup):
             try:
-                data = json.loads(script.string)
-                if isinstance(data, list):
-                    data = data[0]
-                if data.get("@type") == "Product":
-                    offers = data.get("offers", {})
-                    if isinstance(offers, list):
-                        offers = offers[0] if offers else {}
-                    price = self.parse_price(str(offers.get("price", "")))
-                    if price:
-                        return ScrapedPrice(
-                            price=price,
-                            currency=offers.get("priceCurrency", "CAD"),
-                            available="InStock" in str(offers.get("availability", "")),
-                        )
-            except (json.JSONDecodeError, AttributeError):
+                offers = data.get("offers", {})
+                if isinstance(offers, list):
+                    offers = offers[0] if offers else {}
+                price = self.parse_price(str(offers.get("price", "")))
+                if price:
+                    return ScrapedPrice(
+                        price=price,
+                        currency=offers.get("priceCurrency", "CAD"),
+                        available="InStock" in str(offers.get("availability", "")),
+                    )
+            except AttributeError:
                 continue
 
         # Meta tags
@@ -13,7 +13,7 @@ import logging
 import re
 from urllib.parse import urlsplit, urlunsplit
 
-from src.retailers.base import RetailerBase, ScrapedPrice, ScrapedProduct
+from src.retailers.base import RetailerBase, ScrapedPrice, ScrapedProduct, slugify
 
 logger = logging.getLogger(__name__)
 
@@ -21,24 +21,13 @@ logger = logging.getLogger(__name__)
 class ShopifyBase(RetailerBase):
     """Base scraper for classic Shopify stores with JSON API access."""
 
-    # Subclasses should set brand_slug_map for known brand → collection handle mappings
-    brand_slug_map: dict[str, str] = {}
-
     def _brand_to_slug(self, brand_name: str) -> str:
         """Convert a brand name to a Shopify collection handle."""
-        lower = brand_name.lower()
-        # Check explicit mapping first
-        for key, slug in self.brand_slug_map.items():
-            if key.lower() in lower or lower in key.lower():
-                return slug
-        # Fallback: slugify the name
-        slug = re.sub(r"[^a-z0-9]+", "-", lower).strip("-")
-        return slug
+        # Check explicit mapping first, then fall back to slugifying the name
+        return self._mapped_brand_slug(brand_name) or slugify(brand_name)
 
     async def _fetch_json(self, url: str) -> dict | list | None:
         """Fetch a URL and parse as JSON."""
-        import json
-
         try:
             text = await self._fetch(url)
             return json.loads(text)
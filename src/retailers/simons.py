@@ -60,24 +60,19 @@ class SimonsScraper(RetailerBase):
             return None
 
         # Try JSON-LD first
-        scripts = soup.find_all("script", {"type": "application/ld+json"})
-        for script in scripts:
+        for data in self._json_ld_products(soup):
             try:
-                data = json.loads(script.string)
-                if isinstance(data, list):
-                    data = data[0]
-                if data.get("@type") == "Product":
-                    offers = data.get("offers", {})
-                    if isinstance(offers, list):
-                        offers = offers[0] if offers else {}
-                    price = self.parse_price(str(offers.get("price", "")))
-                    if price:
-                        return ScrapedPrice(
-                            price=price,
-                            currency=offers.get("priceCurrency", "CAD"),
-                            available="InStock" in str(offers.get("availability", "")),
-                        )
-            except (json.JSONDecodeError, AttributeError):
+                offers = data.get("offers", {})
+                if isinstance(offers, list):
+                    offers = offers[0] if offers else {}
+                price = self.parse_price(str(offers.get("price", "")))
+                if price:
+                    return ScrapedPrice(
+                        price=price,
+                        currency=offers.get("priceCurrency", "CAD"),
+                        available="InStock" in str(offers.get("availability", "")),
+                    )
+            except AttributeError:
                 continue
 
         # Try meta tags
@@ -9,10 +9,17 @@ from __future__ import annotations
 
 import json
 import logging
-import re
 import urllib.parse
 
-from src.retailers.base import RetailerBase, ScrapedPrice, ScrapedProduct
+from src.retailers.base import (
+    HTML_PARSER,
+    PRICE_TAGS,
+    RetailerBase,
+    ScrapedPrice,
+    ScrapedProduct,
+    extract_embedded_json,
+    slugify,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -39,11 +46,7 @@ class SSENSEScraper(RetailerBase):
     }
 
     def _brand_to_slug(self, brand_name: str) -> str:
-        lower = brand_name.lower()
-        for key, slug in self.brand_slug_map.items():
-            if key in lower or lower in key:
-                return slug
-        return re.sub(r"[^a-z0-9]+", "-", lower).strip("-")
+        return self._mapped_brand_slug(brand_name) or slugify(brand_name)
 
     async def search_brand(self, brand_name: str) -> list[ScrapedProduct]:
         slug = self._brand_to_slug(brand_name)
@@ -66,30 +69,25 @@ class SSENSEScraper(RetailerBase):
 
     async def get_price(self, product_url: str) -> ScrapedPrice | None:
         try:
-            soup = await self._fetch_soup(product_url)
+            soup = await self._fetch_soup(product_url, parse_only=PRICE_TAGS)
         except Exception:
             logger.exception(f"{self.name}: Failed to fetch {product_url}")
             return None
 
         # Try JSON-LD
-        scripts = soup.find_all("script", {"type": "application/ld+json"})
-        for script in scripts:
+        for data in self._json_ld_products(soup):
             try:
-                data = json.loads(script.string)
-                if isinstance(data, list):
-                    data = data[0]
-                if data.get("@type") == "Product":
-                    offers = data.get("offers", {})
-                    if isinstance(offers, list):
-                        offers = offers[0] if offers else {}
-                    price = self.parse_price(str(offers.get("price", "")))
-                    if price:
-                        return ScrapedPrice(
-                            price=price,
-                            currency=offers.get("priceCurrency", "CAD"),
-                            available="InStock" in str(offers.get("availability", "")),
-                        )
-            except (json.JSONDecodeError, AttributeError):
+                offers = data.get("offers", {})
+                if isinstance(offers, list):
+                    offers = offers[0] if offers else {}
+                price = self.parse_price(str(offers.get("price", "")))
+                if price:
+                    return ScrapedPrice(
+                        price=price,
+                        currency=offers.get("priceCurrency", "CAD"),
+                        available="InStock" in str(offers.get("availability", "")),
+                    )
+            except AttributeError:
                 continue
 
         # Try meta tags
@@ -106,27 +104,27 @@ class SSENSEScraper(RetailerBase):
         products: list[ScrapedProduct] = []
 
         # SSENSE embeds product data in __NEXT_DATA__ or similar script tags
-        patterns = [
-            r'__NEXT_DATA__\s*=\s*(\{.+?\})\s*;?\s*</script>',
-            r'"products"\s*:\s*(\[.+?\])\s*[,}]',
-            r'window\.__PRELOADED_STATE__\s*=\s*(\{.+?\})\s*;?\s*</script>',
+        anchors = [
+            ("__NEXT_DATA__", "="),
+            ('"products"', ":"),
+            ("window.__PRELOADED_STATE__", "="),
         ]
 
-        for pattern in patterns:
-            match = re.search(pattern, html, re.DOTALL)
-            if match:
-                try:
-                    data = json.loads(match.group(1))
-                    extracted = self._parse_next_data(data, gender)
-                    if extracted:
-                        return extracted
-                except (json.JSONDecodeError, KeyError):
-                    continue
+        for anchor, separator in anchors:
+            data = extract_embedded_json(html, anchor, separator)
+            if data is None:
+                continue
+            try:
+                extracted = self._parse_next_data(data, gender)
+                if extracted:
+                    return extracted
+            except KeyError:
+                continue
 
         # Fallback: parse JSON-LD from HTML
         from bs4 import BeautifulSoup
 
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, HTML_PARSER)
         scripts = soup.find_all("script", {"type": "application/ld+json"})
         for script in scripts:
             try:
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.models import PriceRecord, Product
+from src.db.models import PriceRecord, Product, utcnow
 
 
 @dataclass
@@ -26,7 +26,7 @@ async def get_price_history(
     product_id: int,
     days: int = 90,
 ) -> list[PriceRecord]:
-    since = dt.datetime.utcnow() - dt.timedelta(days=days)
+    since = utcnow() - dt.timedelta(days=days)
     result = await session.execute(
         select(PriceRecord)
         .where(PriceRecord.product_id == product_id)
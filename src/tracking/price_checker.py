@@ -4,7 +4,6 @@ import datetime as dt
 import logging
 from dataclasses import dataclass
 
-import httpx
 from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -12,7 +11,8 @@ from sqlalchemy.orm import selectinload
 from src.alerts.notifier import send_alert
 from src.alerts.rules import check_price_alert
 from src.config import settings
-from src.db.models import AlertEvent, PriceRecord, Product, Retailer
+from src.db.models import AlertEvent, PriceRecord, Product, Retailer, utcnow
+from src.http_client import get_http_client
 from src.retailers.base import RetailerBase
 
 logger = logging.getLogger(__name__)
@@ -32,9 +32,13 @@ async def _product_page_is_gone(url: str) -> bool:
     delisted product — we only trust an explicit 404 on the exact stored URL.
     """
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=15) as client:
-            resp = await client.get(url, headers={"User-Agent": "Mozilla/5.0"})
-            return resp.status_code == 404
+        resp = await get_http_client().get(
+            url,
+            headers={"User-Agent": "Mozilla/5.0"},
+            follow_redirects=True,
+            timeout=15,
+        )
+        return resp.status_code == 404
     except Exception:
         return False
 
@@ -79,13 +83,13 @@ async def check_product_price(
         # oldest-checked-first, so a product left unstamped would sit at the head
         # of the queue and be retried on every run forever, starving everything
         # behind it.
-        product.last_checked = dt.datetime.utcnow()
+        product.last_checked = utcnow()
         await session.commit()
         return CheckResult()
 
     if not result.available:
         logger.info(f"Product out of stock, keeping: {product.name}")
-        product.last_checked = dt.datetime.utcnow()
+        product.last_checked = utcnow()
         await session.commit()
         return CheckResult()
 
@@ -103,7 +107,7 @@ async def check_product_price(
     product.current_price = result.price
     product.original_price = result.original_price
     product.on_sale = result.on_sale
-    product.last_checked = dt.datetime.utcnow()
+    product.last_checked = utcnow()
 
     if old_price > 0 and result.price < old_price:
         events = await check_price_alert(session, product, old_price, result.price)
@@ -164,7 +168,7 @@ async def check_all_prices(
     for product in products:
         scraper = scrapers.get(product.retailer.scraper_type)
         if scraper is None:  # defensive — the query filter should prevent this
-            product.last_checked = dt.datetime.utcnow()
+            product.last_checked = utcnow()
             await session.commit()
             continue
 
@@ -179,7 +183,7 @@ async def check_all_prices(
     # How many scrapable products are still stale (never checked, or not checked
     # within a full cycle). This is the number to watch: if it trends down to ~0
     # the batches are keeping up, if it plateaus high they are not.
-    stale_cutoff = dt.datetime.utcnow() - dt.timedelta(hours=24)
+    stale_cutoff = utcnow() - dt.timedelta(hours=24)
     remaining = (
         await session.execute(
             select(func.count(Product.id))
@@ -2,13 +2,13 @@ from __future__ import annotations
 
 import logging
 
-import httpx
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
 from src.config import settings
 from src.db.session import async_session
+from src.http_client import get_http_client
 from src.tracking.price_checker import check_all_prices
 
 logger = logging.getLogger(__name__)
@@ -23,8 +23,7 @@ async def scheduled_price_check() -> None:
     async with async_session() as session:
         from src.retailers import get_all_scrapers
 
-        scrapers = get_all_scrapers()
-        scrapers = {k: v for k, v in scrapers.items() if k not in SKIP_SCRAPERS}
+        scrapers = get_all_scrapers(skip=SKIP_SCRAPERS)
         try:
             stats = await check_all_prices(session, scrapers)
             logger.info(
@@ -45,8 +44,7 @@ async def scheduled_discovery() -> None:
     from src.brands.discovery import discover_and_store
     from src.retailers import get_all_scrapers
 
-    scrapers = get_all_scrapers()
-    scrapers = {k: v for k, v in scrapers.items() if k not in SKIP_SCRAPERS}
+    scrapers = get_all_scrapers(skip=SKIP_SCRAPERS)
 
     try:
         async with async_session() as session:
@@ -65,9 +63,8 @@ async def scheduled_discovery() -> None:
 async def keep_alive_ping(url: str) -> None:
     """Ping our own /health endpoint to prevent Render free tier from sleeping."""
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(f"{url}/health", timeout=10)
-            logger.debug(f"Keep-alive ping: {resp.status_code}")
+        resp = await get_http_client().get(f"{url}/health", timeout=10)
+        logger.debug(f"Keep-alive ping: {resp.status_code}")
     except Exception:
         logger.warning("Keep-alive ping failed")
 
@@ -0,0 +1,61 @@
+"""Tests for alert rule evaluation."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from src.alerts.rules import check_price_alert
+from src.db.models import AlertEvent, AlertRule, Brand, Notification, Product, Retailer
+
+
+async def _seed(session, *rules: AlertRule) -> Product:
+    brand = Brand(name="Nanga", slug="nanga", aliases="[]")
+    retailer = Retailer(name="Shop", slug="shop", base_url="https://s.test")
+    session.add_all([brand, retailer])
+    await session.flush()
+
+    product = Product(
+        name="Aurora Down Jacket",
+        brand_id=brand.id,
+        retailer_id=retailer.id,
+        url="https://s.test/p/aurora",
+        current_price=40_000,
+    )
+    session.add(product)
+    for rule in rules:
+        rule.brand_id = brand.id
+        session.add(rule)
+    await session.commit()
+
+    return (
+        await session.execute(
+            select(Product).options(selectinload(Product.brand)).where(Product.id == product.id)
+        )
+    ).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_each_fired_rule_gets_an_event_and_linked_notification(db_session):
+    product = await _seed(
+        db_session,
+        AlertRule(condition="pct_drop", threshold_pct=10.0),
+        AlertRule(condition="any_sale", notify_dashboard=False),
+    )
+
+    events = await check_price_alert(db_session, product, 40_000, 30_000)
+
+    assert len(events) == 2
+    assert all(e.id is not None for e in events)
+    notifications = (await db_session.execute(select(Notification))).scalars().all()
+    assert len(notifications) == 1, "only the dashboard-enabled rule notifies"
+    assert notifications[0].alert_event_id in {e.id for e in events}
+    assert "25%" in notifications[0].message
+
+
+@pytest.mark.asyncio
+async def test_drop_below_threshold_fires_nothing(db_session):
+    product = await _seed(db_session, AlertRule(condition="pct_drop", threshold_pct=30.0))
+
+    assert await check_price_alert(db_session, product, 40_000, 36_000) == []
+    assert (await db_session.execute(select(AlertEvent))).scalars().all() == []
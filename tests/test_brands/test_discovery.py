@@ -0,0 +1,292 @@
+"""Tests for full discovery across brands and retailers.
+
+Retailers are scanned concurrently, but everything lands through a single
+session, so the counts and stored rows must match a serial run exactly.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from src.brands import discovery
+from src.brands.discovery import (
+    _search_brand_at_retailer,
+    discover_and_store,
+    discover_single_brand,
+    store_scraped_products,
+)
+from src.db.models import Brand, BrandRetailer, PriceRecord, Product, Retailer
+from src.retailers.base import RetailerBase, ScrapedPrice, ScrapedProduct
+
+
+class FakeScraper(RetailerBase):
+    """Returns one product per search, keyed by whichever store it points at."""
+
+    name = "Fake"
+    slug = "fake"
+    base_url = "https://fake.test"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.searched: list[str] = []
+
+    async def search_brand(self, brand_name: str) -> list[ScrapedProduct]:
+        self.searched.append(brand_name)
+        handle = brand_name.lower().replace(" ", "-")
+        return [
+            ScrapedProduct(
+                name=f"{brand_name} Jacket",
+                url=f"{self.base_url}/products/{handle}-jacket",
+                price=12_000,
+                brand=brand_name,
+            )
+        ]
+
+    async def get_price(self, product_url: str) -> ScrapedPrice | None:
+        return None
+
+
+class FakeGenericScraper(FakeScraper):
+    slug = "generic"
+
+
+async def _seed(session) -> None:
+    session.add_all(
+        [
+            Brand(name="Ciele", slug="ciele", aliases="[]"),
+            Brand(name="Nanga", slug="nanga", aliases="[]"),
+            Retailer(
+                name="Shop A", slug="shop-a", base_url="https://a.test", scraper_type="generic"
+            ),
+            Retailer(
+                name="Shop B", slug="shop-b", base_url="https://b.test", scraper_type="generic"
+            ),
+            Retailer(
+                name="Shop C", slug="shop-c", base_url="https://c.test", scraper_type="fake"
+            ),
+            Retailer(
+                name="Unscrapable", slug="x", base_url="https://x.test", scraper_type="ssense"
+            ),
+        ]
+    )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_every_brand_is_stored_for_every_scrapable_retailer(db_session):
+    await _seed(db_session)
+    scrapers = {"generic": FakeGenericScraper(), "fake": FakeScraper()}
+
+    stats = await discover_and_store(db_session, scrapers, concurrency=2)
+
+    assert stats["retailers_checked"] == 3
+    assert stats["mappings_created"] == 6
+    assert stats["new_products"] == 6
+
+    mappings = (await db_session.execute(select(BrandRetailer))).scalars().all()
+    assert len(mappings) == 6
+    assert len((await db_session.execute(select(PriceRecord))).scalars().all()) == 6
+
+
+@pytest.mark.asyncio
+async def test_rerun_does_not_duplicate_mappings(db_session):
+    await _seed(db_session)
+    scrapers = {"generic": FakeGenericScraper(), "fake": FakeScraper()}
+
+    await discover_and_store(db_session, scrapers)
+    stats = await discover_and_store(db_session, scrapers)
+
+    assert stats["new_products"] == 0
+    mappings = (await db_session.execute(select(BrandRetailer))).scalars().all()
+    assert len(mappings) == 6
+
+
+@pytest.mark.asyncio
+async def test_failed_store_does_not_stop_the_other_retailers(db_session, monkeypatch):
+    """One store raising rolls back only its own batch; the run carries on."""
+    await _seed(db_session)
+    scrapers = {"generic": FakeGenericScraper(), "fake": FakeScraper()}
+    real_store = discovery.store_scraped_products
+    calls = 0
+
+    async def _store_failing_first(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("store failed")
+        return await real_store(*args, **kwargs)
+
+    monkeypatch.setattr(discovery, "store_scraped_products", _store_failing_first)
+
+    stats = await discover_and_store(db_session, scrapers, concurrency=1)
+
+    assert stats["mappings_created"] == 5
+    assert stats["new_products"] == 5
+    mappings = (await db_session.execute(select(BrandRetailer))).scalars().all()
+    assert len(mappings) == 5
+    assert len((await db_session.execute(select(Product))).scalars().all()) == 5
+
+
+@pytest.mark.asyncio
+async def test_generic_retailers_do_not_share_a_base_url(db_session):
+    """Concurrent generic retailers must each search their own store."""
+    await _seed(db_session)
+    scrapers = {"generic": FakeGenericScraper(), "fake": FakeScraper()}
+
+    await discover_and_store(db_session, scrapers, concurrency=4)
+
+    urls = {p.url for p in (await db_session.execute(select(Product))).scalars().all()}
+    assert "https://a.test/products/ciele-jacket" in urls
+    assert "https://b.test/products/ciele-jacket" in urls
+
+
+@pytest.mark.asyncio
+async def test_single_brand_searches_retailers_concurrently(db_session):
+    await _seed(db_session)
+    brand = (await db_session.execute(select(Brand).where(Brand.slug == "nanga"))).scalar_one()
+    shared = FakeGenericScraper()
+
+    stats = await discover_single_brand(
+        db_session, brand, {"generic": shared, "fake": FakeScraper()}, concurrency=3
+    )
+
+    assert stats == {"products_found": 3, "new_products": 3, "retailers_matched": 3}
+    assert shared.searched == [], "generic retailers get their own scraper"
+    urls = {p.url for p in (await db_session.execute(select(Product))).scalars().all()}
+    assert urls == {
+        "https://a.test/products/nanga-jacket",
+        "https://b.test/products/nanga-jacket",
+        "https://fake.test/products/nanga-jacket",
+    }
+    mappings = (await db_session.execute(select(BrandRetailer))).scalars().all()
+    assert len(mappings) == 3
+
+
+@pytest.mark.asyncio
+async def test_mapping_is_committed_when_every_product_is_filtered_out(db_session):
+    """A retailer whose only hits are kids items still gets its mapping."""
+
+    class KidsOnlyScraper(FakeScraper):
+        async def search_brand(self, brand_name: str) -> list[ScrapedProduct]:
+            return [
+                ScrapedProduct(
+                    name=f"{brand_name} Kids Jacket",
+                    url=f"{self.base_url}/products/kids-jacket",
+                    price=5_000,
+                    brand=brand_name,
+                )
+            ]
+
+    await _seed(db_session)
+    brand = (await db_session.execute(select(Brand).where(Brand.slug == "ciele"))).scalar_one()
+
+    await discover_single_brand(db_session, brand, {"fake": KidsOnlyScraper()})
+    # Anything not committed is gone after this
+    await db_session.rollback()
+
+    mappings = (await db_session.execute(select(BrandRetailer))).scalars().all()
+    assert len(mappings) == 1
+    assert (await db_session.execute(select(Product))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_store_upserts_on_url_without_blanking_known_fields(db_session):
+    await _seed(db_session)
+    brand = (await db_session.execute(select(Brand).where(Brand.slug == "ciele"))).scalar_one()
+    retailer = (
+        await db_session.execute(select(Retailer).where(Retailer.slug == "shop-c"))
+    ).scalar_one()
+
+    first = [
+        ScrapedProduct(
+            name="Ciele Cap", url="https://c.test/p/cap", price=5_000,
+            image_url="https://c.test/cap.jpg", gender="unisex",
+        ),
+        ScrapedProduct(name="Ciele Kids Cap", url="https://c.test/p/kids-cap", price=3_000),
+    ]
+    assert await store_scraped_products(db_session, brand, retailer, first) == 1
+
+    # Same URL again: a sale price, no image, plus a duplicate in the batch.
+    second = [
+        ScrapedProduct(
+            name="Ciele Cap", url="https://c.test/p/cap", price=4_000,
+            original_price=5_000, on_sale=True,
+        ),
+        ScrapedProduct(name="Ciele Cap", url="https://c.test/p/cap", price=4_000),
+        ScrapedProduct(name="Ciele Shorts", url="https://c.test/p/shorts", price=7_000),
+    ]
+    assert await store_scraped_products(db_session, brand, retailer, second) == 1
+
+    db_session.expire_all()
+    products = {
+        p.url: p for p in (await db_session.execute(select(Product))).scalars().all()
+    }
+    assert set(products) == {"https://c.test/p/cap", "https://c.test/p/shorts"}
+    cap = products["https://c.test/p/cap"]
+    assert cap.current_price == 4_000
+    assert cap.on_sale is True
+    assert cap.image_url == "https://c.test/cap.jpg", "empty scrape must not blank the image"
+    assert cap.gender == "unisex"
+
+    records = (await db_session.execute(select(PriceRecord))).scalars().all()
+    assert sorted(r.price for r in records if r.product_id == cap.id) == [4_000, 5_000]
+
+
+class AliasScraper(FakeScraper):
+    """Finds nothing under the brand name, hangs on one alias."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.cancelled: list[str] = []
+
+    async def search_brand(self, brand_name: str) -> list[ScrapedProduct]:
+        if brand_name == "Arcteryx Hang":
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                self.cancelled.append(brand_name)
+                raise
+        if brand_name == "Arc'teryx":
+            return []
+        return await super().search_brand(brand_name)
+
+
+@pytest.mark.asyncio
+async def test_alias_search_returns_first_hit_and_cancels_the_rest():
+    brand = Brand(
+        name="Arc'teryx", slug="arcteryx", aliases='["Arcteryx Hang", "Arcteryx"]'
+    )
+    retailer = Retailer(name="Shop", slug="shop", base_url="https://shop.test")
+    scraper = AliasScraper()
+
+    products = await asyncio.wait_for(
+        _search_brand_at_retailer(brand, retailer, scraper), timeout=1
+    )
+    await asyncio.sleep(0)
+
+    assert [p.name for p in products] == ["Arcteryx Jacket"]
+    assert scraper.cancelled == ["Arcteryx Hang"]
+
+
+class EmptyScraper(FakeScraper):
+    """Records every search and finds nothing, so all terms get tried."""
+
+    async def search_brand(self, brand_name: str) -> list[ScrapedProduct]:
+        self.searched.append(brand_name)
+        return []
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_terms_are_searched_once():
+    brand = Brand(
+        name="Arc'teryx", slug="arcteryx", aliases='["Arcteryx", "Arc\'teryx", " ", "arcteryx"]'
+    )
+    retailer = Retailer(name="Shop", slug="shop", base_url="https://shop.test")
+    scraper = EmptyScraper()
+
+    await _search_brand_at_retailer(brand, retailer, scraper)
+
+    # Spelling variants stay: they map to different collection handles.
+    assert sorted(scraper.searched) == ["Arc'teryx", "Arcteryx"]
@@ -1,5 +1,5 @@
 """Unit tests for brand matching logic."""
-from src.brands.discovery import _brand_matches, _normalize
+from src.brands.discovery import _brand_matches, _is_kids_product, _normalize
 
 
 def test_normalize_removes_punctuation():
@@ -134,3 +134,12 @@ def test_mixed_compound_and_single_aliases():
     assert _brand_matches("Nike ACG", "ACG", ["ACG", "Nike ACG"]) is True  # exact match
     # But NOT substring
     assert _brand_matches("Nike", "ACG", ["ACG", "Nike ACG"]) is False
+
+
+def test_kids_products_are_detected_case_insensitively():
+    """Kids keywords match anywhere in the name, in any case or language."""
+    assert _is_kids_product("Nike Air Max 90 GS") is True
+    assert _is_kids_product("BÉBÉ Doudoune") is True
+    assert _is_kids_product("Youth Fleece Jacket") is True
+    assert _is_kids_product("Men's Shell Jacket") is False
+    assert _is_kids_product("Salomon XT-6") is False
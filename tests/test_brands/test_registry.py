@@ -0,0 +1,41 @@
+"""Tests for seeding brands and retailers."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+
+from src.brands.registry import INITIAL_BRANDS, INITIAL_RETAILERS, seed_brands, seed_retailers
+from src.db.models import Brand, Retailer
+
+
+@pytest.mark.asyncio
+async def test_seed_brands_is_idempotent(db_session):
+    extra = [{"name": "New Label", "aliases": '["NL"]'}]
+    await seed_brands(db_session, extra_brands=extra)
+    await seed_brands(db_session, extra_brands=extra)
+
+    count = await db_session.scalar(select(func.count()).select_from(Brand))
+    assert count == len(INITIAL_BRANDS) + 1
+    new = await db_session.scalar(select(Brand).where(Brand.slug == "new-label"))
+    assert new.aliases_list == ["NL"]
+
+
+@pytest.mark.asyncio
+async def test_seed_retailers_upgrades_but_never_downgrades_scraper_type(db_session):
+    seed = INITIAL_RETAILERS[0]
+    db_session.add(Retailer(
+        name=seed["name"], slug=seed["slug"], base_url=seed["base_url"], scraper_type="generic",
+    ))
+    db_session.add(Retailer(
+        name="Custom", slug="custom", base_url="https://custom.example", scraper_type="shopify",
+    ))
+    await db_session.commit()
+
+    await seed_retailers(db_session, extra_retailers=[
+        {"name": "Custom", "slug": "custom", "scraper_type": "generic"},
+    ])
+
+    types = dict((await db_session.execute(select(Retailer.slug, Retailer.scraper_type))).all())
+    assert types[seed["slug"]] == seed["scraper_type"]
+    assert types["custom"] == "shopify"
+    assert len(types) == len(INITIAL_RETAILERS) + 1
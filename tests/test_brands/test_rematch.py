@@ -0,0 +1,66 @@
+"""Tests for re-matching a brand's products after an alias change."""
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from src.brands.rematch import rematch_brand_products
+from src.db.models import Brand, Product, Retailer
+
+
+async def _brand_with_product(session, aliases: list[str]) -> Brand:
+    brand = Brand(name="Arc'teryx", slug="arcteryx", aliases=json.dumps(aliases))
+    retailer = Retailer(name="Shop", slug="shop", base_url="https://shop.test")
+    session.add_all([brand, retailer])
+    await session.flush()
+    session.add(Product(
+        name="Beta Jacket", brand_id=brand.id, retailer_id=retailer.id,
+        url="https://shop.test/products/beta-jacket",
+    ))
+    await session.commit()
+    return brand
+
+
+async def _product_count(session) -> int:
+    return await session.scalar(select(func.count()).select_from(Product))
+
+
+@pytest.mark.asyncio
+async def test_added_alias_keeps_existing_products(db_session):
+    brand = await _brand_with_product(db_session, ["Arcteryx"])
+    old_aliases = brand.aliases_list
+    brand.aliases = json.dumps(["Arcteryx", "Veilance"])
+
+    stats = await rematch_brand_products(db_session, brand, old_aliases)
+
+    assert stats == {"deleted": 0}
+    assert await _product_count(db_session) == 1
+
+
+@pytest.mark.asyncio
+async def test_removed_alias_deletes_products(db_session):
+    brand = await _brand_with_product(db_session, ["Arcteryx", "Veilance"])
+    old_aliases = brand.aliases_list
+    brand.aliases = json.dumps(["Arcteryx"])
+
+    stats = await rematch_brand_products(db_session, brand, old_aliases)
+
+    assert stats == {"deleted": 1}
+    assert await _product_count(db_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_rename_with_added_alias_deletes_products(db_session):
+    """Products matched on the old name alone may not match the new one."""
+    brand = await _brand_with_product(db_session, ["Veilance"])
+    old_name, old_aliases = brand.name, brand.aliases_list
+    # Judged on the new name alone this only adds an alias
+    brand.name = "Veilance"
+    brand.aliases = json.dumps(["Veilance", "Squamish"])
+
+    stats = await rematch_brand_products(db_session, brand, old_aliases, old_name)
+
+    assert stats == {"deleted": 1}
+    assert await _product_count(db_session) == 0
@@ -0,0 +1,155 @@
+"""Tests for the startup schema fixups in src.db.session."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.db.models import Base
+from src.db.session import (
+    _drop_replaced_indexes,
+    _ensure_columns,
+    _ensure_indexes,
+    _ensure_unique_constraints,
+    _read_schema_fingerprint,
+    _schema_fingerprint,
+    _write_schema_fingerprint,
+)
+
+
+def _unique_column_sets(conn, table: str) -> set[tuple[str, ...]]:
+    inspector = sa_inspect(conn)
+    return {
+        tuple(idx["column_names"]) for idx in inspector.get_indexes(table) if idx["unique"]
+    } | {tuple(uc["column_names"]) for uc in inspector.get_unique_constraints(table)}
+
+
+@pytest.mark.asyncio
+async def test_missing_unique_constraint_is_backfilled():
+    """A products table created before uq_product_url gets a unique url index."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP TABLE products"))
+        await conn.execute(text(
+            "CREATE TABLE products (id INTEGER PRIMARY KEY, url VARCHAR(1000))"
+        ))
+        assert ("url",) not in await conn.run_sync(_unique_column_sets, "products")
+
+        await conn.run_sync(_ensure_unique_constraints)
+        # A second run finds it covered and leaves it alone.
+        await conn.run_sync(_ensure_unique_constraints)
+
+        assert ("url",) in await conn.run_sync(_unique_column_sets, "products")
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_violated_unique_constraint_is_skipped_without_aborting():
+    """Duplicate urls make the index impossible; later statements still run.
+
+    The index is created in a savepoint. On Postgres, a failed statement
+    outside one would abort init_db's transaction for every later fixup.
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP TABLE products"))
+        await conn.execute(text(
+            "CREATE TABLE products (id INTEGER PRIMARY KEY, url VARCHAR(1000))"
+        ))
+        await conn.execute(text(
+            "INSERT INTO products (url) VALUES ('https://a.test/p'), ('https://a.test/p')"
+        ))
+
+        await conn.run_sync(_ensure_unique_constraints)
+
+        assert ("url",) not in await conn.run_sync(_unique_column_sets, "products")
+        await conn.run_sync(_write_schema_fingerprint, "after-skip")
+        assert await conn.run_sync(_read_schema_fingerprint) == "after-skip"
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_missing_columns_are_added():
+    """An old brands table gains every column the model has since grown."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP TABLE brands"))
+        await conn.execute(text(
+            "CREATE TABLE brands (id INTEGER PRIMARY KEY, name VARCHAR(200), slug VARCHAR(200))"
+        ))
+        await conn.execute(text("INSERT INTO brands (name, slug) VALUES ('APC', 'apc')"))
+
+        await conn.run_sync(_ensure_columns)
+
+        columns = await conn.run_sync(
+            lambda c: {col["name"] for col in sa_inspect(c).get_columns("brands")}
+        )
+        assert columns == set(Base.metadata.tables["brands"].columns.keys())
+        category = await conn.scalar(text("SELECT category FROM brands"))
+        assert category == ""
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_schema_fingerprint_roundtrip():
+    """The stored fingerprint is read back, and rewriting it replaces it."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        # No app_meta table yet (a database from before the fingerprint)
+        assert await conn.run_sync(_read_schema_fingerprint) is None
+
+        await conn.run_sync(Base.metadata.create_all)
+        assert await conn.run_sync(_read_schema_fingerprint) is None
+
+        await conn.run_sync(_write_schema_fingerprint, "old")
+        await conn.run_sync(_write_schema_fingerprint, _schema_fingerprint())
+
+        assert await conn.run_sync(_read_schema_fingerprint) == _schema_fingerprint()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_replaced_price_record_index_is_dropped():
+    """Databases from before the composite index lose the old product_id one."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text(
+            "CREATE INDEX ix_price_records_product_id ON price_records (product_id)"
+        ))
+
+        await conn.run_sync(_drop_replaced_indexes)
+        # Idempotent: nothing left to drop the second time
+        await conn.run_sync(_drop_replaced_indexes)
+
+        names = await conn.run_sync(
+            lambda c: {idx["name"] for idx in sa_inspect(c).get_indexes("price_records")}
+        )
+        assert "ix_price_records_product_id" not in names
+        assert "ix_price_records_product_recorded" in names
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_old_on_sale_indexes_give_way_to_the_desc_one():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("CREATE INDEX ix_products_on_sale ON products (on_sale)"))
+        await conn.execute(text(
+            "CREATE INDEX ix_products_on_sale_last_checked ON products (on_sale, last_checked)"
+        ))
+
+        await conn.run_sync(_ensure_indexes)
+        await conn.run_sync(_drop_replaced_indexes)
+
+        names = await conn.run_sync(
+            lambda c: {idx["name"] for idx in sa_inspect(c).get_indexes("products")}
+        )
+        assert "ix_products_on_sale_recent" in names
+        assert not names & {"ix_products_on_sale", "ix_products_on_sale_last_checked"}
+    await engine.dispose()
@@ -0,0 +1,52 @@
+"""Tests for the startup fixups in src.main."""
+from __future__ import annotations
+
+import logging
+
+import pytest
+from sqlalchemy import select
+
+from src.db.models import Retailer
+from src.main import _fix_scraper_types
+
+
+@pytest.mark.asyncio
+async def test_fix_scraper_types_rewrites_only_stale_rows(db_session, caplog):
+    db_session.add_all([
+        Retailer(name="Blue Button Shop", slug="blue-button-shop",
+                 base_url="https://www.bluebuttonshop.com", scraper_type="generic"),
+        Retailer(name="Haven", slug="haven",
+                 base_url="https://shop.havenshop.com", scraper_type="haven"),
+        Retailer(name="Some Boutique", slug="some-boutique",
+                 base_url="https://someboutique.ca", scraper_type="generic"),
+    ])
+    await db_session.commit()
+
+    with caplog.at_level(logging.INFO, logger="src.main"):
+        await _fix_scraper_types(db_session)
+
+    db_session.expire_all()
+    types = dict((await db_session.execute(
+        select(Retailer.slug, Retailer.scraper_type)
+    )).all())
+    assert types == {
+        "blue-button-shop": "bluebuttonshop",
+        "haven": "haven",
+        "some-boutique": "generic",
+    }
+    assert "Blue Button Shop: generic -> bluebuttonshop" in caplog.text
+    assert "Haven" not in caplog.text
+    assert "Some Boutique" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_fix_scraper_types_leaves_correct_rows_alone(db_session, caplog):
+    db_session.add(Retailer(name="Blue Button Shop", slug="blue-button-shop",
+                            base_url="https://www.bluebuttonshop.com",
+                            scraper_type="bluebuttonshop"))
+    await db_session.commit()
+
+    with caplog.at_level(logging.INFO, logger="src.main"):
+        await _fix_scraper_types(db_session)
+
+    assert "Auto-fixed" not in caplog.text
@@ -0,0 +1,29 @@
+"""Tests for mapping brand names to retailer URL slugs."""
+from __future__ import annotations
+
+from src.retailers.bluebuttonshop import BlueButtonShopScraper
+from src.retailers.generic import GenericScraper
+from src.retailers.nrml import NRMLScraper
+from src.retailers.ssense import SSENSEScraper
+
+
+def test_longer_mapped_key_wins_over_a_prefix_of_it():
+    scraper = BlueButtonShopScraper()
+    assert scraper._brand_to_url_slug("Goldwin 0") == "Goldwin-0"
+    assert scraper._brand_to_url_slug("Goldwin") == "Goldwin"
+
+
+def test_short_alias_still_finds_the_key_containing_it():
+    assert NRMLScraper()._brand_to_slug("On") == "on-cloud"
+    assert NRMLScraper()._brand_to_slug("New Balance Made in USA") == "new-balance"
+
+
+def test_unmapped_brand_is_slugified():
+    assert GenericScraper()._brand_to_slug("District Vision") == "district-vision"
+
+
+def test_ssense_goes_through_the_shared_lookup():
+    scraper = SSENSEScraper()
+    assert scraper._brand_to_slug("Satisfy Running") == "satisfy"
+    assert scraper._brand_to_slug("On Running") == "on"
+    assert scraper._brand_to_slug("Our Legacy") == "our-legacy"
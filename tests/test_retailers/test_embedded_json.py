@@ -0,0 +1,28 @@
+"""Tests for pulling JSON assignments out of page source."""
+from __future__ import annotations
+
+from src.retailers.base import extract_embedded_json
+
+
+def test_braces_inside_strings_do_not_end_the_value():
+    html = (
+        '<script>window.__remixContext = {"title": "Tee {limited}", '
+        '"tags": ["}"]};</script>'
+    )
+    assert extract_embedded_json(html, "window.__remixContext") == {
+        "title": "Tee {limited}",
+        "tags": ["}"],
+    }
+
+
+def test_skips_occurrences_without_a_value():
+    html = (
+        '<p>"products" are below</p>'
+        '<script>{"products": [{"name": "Shell"}]}</script>'
+    )
+    assert extract_embedded_json(html, '"products"', ":") == [{"name": "Shell"}]
+
+
+def test_returns_none_when_nothing_decodes():
+    assert extract_embedded_json("window.__STATE__ = {broken", "window.__STATE__") is None
+    assert extract_embedded_json("<html></html>", "window.__STATE__") is None
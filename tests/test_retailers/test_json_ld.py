@@ -0,0 +1,25 @@
+"""Tests for picking JSON-LD Product blocks off a product page."""
+from __future__ import annotations
+
+from bs4 import BeautifulSoup
+
+from src.retailers.base import HTML_PARSER, PRICE_TAGS, RetailerBase
+
+
+def _soup(*blocks: str) -> BeautifulSoup:
+    html = "".join(f'<script type="application/ld+json">{b}</script>' for b in blocks)
+    return BeautifulSoup(html, HTML_PARSER, parse_only=PRICE_TAGS)
+
+
+def test_yields_only_product_blocks():
+    soup = _soup(
+        '{"@type": "BreadcrumbList", "itemListElement": []}',
+        '[{"@type": "Product", "name": "Shell", "offers": {"price": "450.00"}}]',
+        '{"@type": "Organization", "name": "Shop"}',
+    )
+    assert [p["name"] for p in RetailerBase._json_ld_products(soup)] == ["Shell"]
+
+
+def test_skips_blocks_that_do_not_decode():
+    soup = _soup('{"@type": "Product", broken', "[]", '{"@type": "Product", "name": "Tee"}')
+    assert [p["name"] for p in RetailerBase._json_ld_products(soup)] == ["Tee"]
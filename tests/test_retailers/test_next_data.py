@@ -93,3 +93,9 @@ def test_extract_next_data_needs_raw_html_not_stripped_text():
 
 def test_malformed_json_does_not_raise():
     assert extract_next_data('<script id="__NEXT_DATA__">{not json</script>') is None
+
+
+def test_extract_next_data_with_extra_attributes_and_unclosed_tag():
+    html = '<script id="__NEXT_DATA__" type="application/json">{"a": [1]}</script>'
+    assert extract_next_data(html) == {"a": [1]}
+    assert extract_next_data('<script id="__NEXT_DATA__">{"a": 1}') is None
@@ -0,0 +1,27 @@
+"""Tests for RetailerBase.parse_price (price text -> cents)."""
+from __future__ import annotations
+
+from src.retailers.base import RetailerBase
+
+
+def test_parses_dollar_amounts_to_cents():
+    assert RetailerBase.parse_price("$1,299.50 CAD") == 129950
+    assert RetailerBase.parse_price("160") == 16000
+
+
+def test_unparseable_text_is_none():
+    assert RetailerBase.parse_price("") is None
+    assert RetailerBase.parse_price("Sold out") is None
+
+
+def test_repeated_prices_come_from_the_cache():
+    RetailerBase.parse_price.cache_clear()
+    RetailerBase.parse_price("$199.00")
+    RetailerBase.parse_price("$199.00")
+    assert RetailerBase.parse_price.cache_info().hits == 1
+
+
+def test_no_cent_lost_to_float_rounding():
+    # float("19.99") * 100 == 1998.9999999999998
+    assert RetailerBase.parse_price("19.99") == 1999
+    assert RetailerBase.parse_price("$0.29") == 29
@@ -0,0 +1,150 @@
+"""Tests for the per-retailer back-off on HTTP 429.
+
+A retailer that starts rate limiting should be slowed down rather than
+hammered, and should be sped back up once it recovers.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.retailers import base
+from src.retailers.base import MAX_REQUEST_DELAY_SECONDS, RetailerBase
+
+
+class FakeScraper(RetailerBase):
+    name = "Fake"
+    slug = "fake"
+    base_url = "https://fake.test"
+
+    async def search_brand(self, brand_name: str) -> list:
+        return []
+
+    async def get_price(self, product_url: str):
+        return None
+
+
+def _scraper(monkeypatch, statuses: list[int], retry_after: str = "") -> FakeScraper:
+    """A scraper whose client answers with the given status codes in turn."""
+    sleeps: list[float] = []
+
+    async def _sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(base.settings, "REQUEST_DELAY_SECONDS", 0)
+    monkeypatch.setattr(base.asyncio, "sleep", _sleep)
+
+    responses = iter(statuses)
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        status = next(responses)
+        headers = {"Retry-After": retry_after} if status == 429 and retry_after else {}
+        return httpx.Response(status, text="ok", headers=headers)
+
+    scraper = FakeScraper()
+    scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    scraper.sleeps = sleeps
+    return scraper
+
+
+@pytest.mark.asyncio
+async def test_429_is_retried_after_backing_off(monkeypatch):
+    scraper = _scraper(monkeypatch, [429, 200], retry_after="5")
+
+    assert await scraper._fetch("https://fake.test/a") == "ok"
+    assert scraper.sleeps == [0, pytest.approx(5.0, abs=0.1)], (
+        "second attempt should wait out Retry-After"
+    )
+
+
+@pytest.mark.asyncio
+async def test_persistent_429_raises_and_delay_is_capped(monkeypatch):
+    scraper = _scraper(monkeypatch, [429, 429, 429], retry_after="600")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await scraper._fetch("https://fake.test/a")
+    assert scraper._delay == MAX_REQUEST_DELAY_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_successes_walk_the_delay_back_to_baseline(monkeypatch):
+    scraper = _scraper(monkeypatch, [429, 200, 200, 200, 200], retry_after="3")
+
+    await scraper._fetch("https://fake.test/a")
+    assert scraper._delay == 2.0  # 3s from Retry-After, minus one step
+    for _ in range(3):
+        await scraper._fetch("https://fake.test/a")
+    assert scraper._delay == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_wait_out_the_delay_one_at_a_time(monkeypatch):
+    """Overlapping searches must not all fire at the retailer at once."""
+    scraper = _scraper(monkeypatch, [200, 200])
+    real_sleep = asyncio.sleep
+    events: list[str] = []
+
+    async def _sleep(seconds: float) -> None:
+        events.append("start")
+        await real_sleep(0.01)
+        events.append("end")
+
+    monkeypatch.setattr(base.asyncio, "sleep", _sleep)
+
+    await asyncio.gather(
+        scraper._fetch("https://fake.test/a"), scraper._fetch("https://fake.test/b")
+    )
+    assert events == ["start", "end", "start", "end"]
+
+
+@pytest.mark.asyncio
+async def test_user_agent_is_sent_per_request_not_set_on_client(monkeypatch):
+    scraper = _scraper(monkeypatch, [])
+    seen: list[str] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["User-Agent"])
+        return httpx.Response(200, text="ok")
+
+    scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    client_agent = scraper._client.headers["User-Agent"]
+
+    await scraper._fetch("https://fake.test/a")
+    assert seen[0] in base.USER_AGENTS
+    assert scraper._client.headers["User-Agent"] == client_agent
+
+
+@pytest.mark.asyncio
+async def test_delay_counts_from_the_previous_request(monkeypatch):
+    """Time already spent since the last request is not waited again."""
+    scraper = _scraper(monkeypatch, [200, 200])
+    scraper._delay = 2.0
+    loop = asyncio.get_running_loop()
+    scraper._last_request = loop.time() - 1.5  # previous request 1.5s ago
+
+    await scraper._fetch("https://fake.test/a")
+    assert scraper.sleeps == [pytest.approx(0.5, abs=0.1)]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_counts_as_a_request_for_the_delay(monkeypatch):
+    scraper = _scraper(monkeypatch, [200, 200])
+    scraper._delay = 2.0
+
+    await scraper.warm_up()
+    await scraper._fetch("https://fake.test/a")
+
+    # The HEAD itself goes straight out; the GET after it waits the delay
+    assert scraper.sleeps[0] == 0
+    assert scraper.sleeps[1] == pytest.approx(2.0, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_skips_a_scraper_without_a_base_url(monkeypatch):
+    scraper = _scraper(monkeypatch, [])
+    scraper.base_url = ""
+
+    await scraper.warm_up()
+    assert scraper.sleeps == []  # never paced, so no request went out